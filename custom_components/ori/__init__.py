@@ -2,7 +2,6 @@
 
 import logging
 
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
@@ -13,7 +12,9 @@ from homeassistant.helpers.typing import ConfigType
 from aquatlantis_ori import AquatlantisOriClient, AquatlantisOriError
 
 from .const import DOMAIN
+from .coordinator import OriConfigEntry, OriCoordinator
 from .services import setup_services
+from .store import OriSnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,34 +37,48 @@ async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
     return True
 
 
-async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry[AquatlantisOriClient]) -> bool:
+async def async_setup_entry(hass: HomeAssistant, config_entry: OriConfigEntry) -> bool:
     """Setup a config entry."""
     email = config_entry.data[CONF_EMAIL]
     password = config_entry.data[CONF_PASSWORD]
     client = AquatlantisOriClient(email, password, async_get_clientsession(hass))
-    config_entry.runtime_data = client
+    coordinator = OriCoordinator(hass, config_entry, client)
+    config_entry.runtime_data = coordinator
+
+    # Stored device snapshots allow creating entities before the devices pushed their data.
+    await coordinator.store.async_load()
 
     try:
         await client.connect()
-        _LOGGER.debug("Waiting for devices to be ready...")
-        # After connecting it takes a little bit of time (<0.5sec) for the device data to be fully populated.
-        # While waiting isn't the best solution, this will make sure all sensors will have data available.
-        # This is important so we can initialize the entities correctly, eg. light type.
-        await client.wait_for_data(interval=0.2, max_wait=2)
-        _LOGGER.debug("Devices are ready")
     except TimeoutError:
-        _LOGGER.warning("Data wasn't available during setup, it should be available soon")
+        _LOGGER.warning("Connecting timed out, the entities of each device are created once its data is received")
     except AquatlantisOriError as exception:
         raise ConfigEntryNotReady from exception
 
+    # Entities are created per device as soon as its first data is pushed or a snapshot is stored, see OriCoordinator.
+    coordinator.async_start()
+    config_entry.async_on_unload(coordinator.async_stop)
+
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
+
     return True
 
 
-async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry[AquatlantisOriClient]) -> bool:
+async def async_reload_entry(hass: HomeAssistant, config_entry: OriConfigEntry) -> None:
+    """Reload a config entry when its options changed."""
+    await hass.config_entries.async_reload(config_entry.entry_id)
+
+
+async def async_unload_entry(hass: HomeAssistant, config_entry: OriConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS):
-        await config_entry.runtime_data.close()
+        await config_entry.runtime_data.client.close()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: OriConfigEntry) -> None:
+    """Remove a config entry."""
+    await OriSnapshotStore(hass, config_entry.entry_id).async_remove()
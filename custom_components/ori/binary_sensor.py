@@ -4,20 +4,18 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import timedelta
 
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity, BinarySensorEntityDescription
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from aquatlantis_ori import AquatlantisOriClient, AvailabilityType, Device, SensorType, SensorValidType
+from aquatlantis_ori import AvailabilityType, Device, SensorType, SensorValidType
 
-from .entity import OriEntity, OriEntityDescription
+from .coordinator import OriConfigEntry
+from .entity import OriEntity, OriEntityDescription, async_add_device_entities
 
 PARALLEL_UPDATES = 0
-SCAN_INTERVAL = timedelta(seconds=10)
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -31,6 +29,7 @@ DESCRIPTIONS: list[OriBinarySensorEntityDescription] = [
     OriBinarySensorEntityDescription(
         key="status",
         translation_key="status",
+        device_fields=frozenset(),
         entity_category=EntityCategory.DIAGNOSTIC,
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         value_fn=lambda device: device.availability_state == AvailabilityType.AVAILABLE,
@@ -38,6 +37,7 @@ DESCRIPTIONS: list[OriBinarySensorEntityDescription] = [
     OriBinarySensorEntityDescription(
         key="water_temperature_problem",
         translation_key="water_temperature_problem",
+        device_fields=frozenset({"sensor_valid", "water_temperature", "water_temperature_thresholds", "app_notifications"}),
         device_class=BinarySensorDeviceClass.PROBLEM,
         available_fn=lambda device: (
             device.availability_state == AvailabilityType.AVAILABLE
@@ -49,7 +49,7 @@ DESCRIPTIONS: list[OriBinarySensorEntityDescription] = [
             if device.water_temperature_thresholds is None or device.water_temperature is None
             else not (device.water_temperature_thresholds.min_value <= device.water_temperature <= device.water_temperature_thresholds.max_value)
         ),
-        is_supported_fn=lambda device: device.sensor_type == SensorType.TEMPERATURE and device.water_temperature_thresholds is not None,
+        is_supported_fn=lambda snapshot: snapshot.sensor_type == SensorType.TEMPERATURE and snapshot.water_temperature_thresholds is not None,
         entity_registry_enabled_default_fn=lambda _: False,
         state_attributes_fn=lambda device: {
             "water_temperature": device.water_temperature,
@@ -63,33 +63,19 @@ DESCRIPTIONS: list[OriBinarySensorEntityDescription] = [
 
 async def async_setup_entry(
     _hass: HomeAssistant,
-    config_entry: ConfigEntry[AquatlantisOriClient],
+    config_entry: OriConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up a Aquatlantis Ori binary sensor entry."""
-    entities: list[BinarySensorEntity] = []
-
-    client = config_entry.runtime_data
-
-    for device in client.get_devices():
-        entities.extend(
-            [
-                OriBinarySensor(
-                    config_entry,
-                    description,
-                    device,
-                )
-                for description in DESCRIPTIONS
-                if description.is_supported_fn(device)
-            ]
-        )
-
-    async_add_entities(entities)
+    async_add_device_entities(config_entry, async_add_entities, (OriBinarySensor, DESCRIPTIONS))
 
 
 class OriBinarySensor(OriEntity[OriBinarySensorEntityDescription], BinarySensorEntity):
     """Representation of a Aquatlantis Ori binary sensor."""
 
+    # Thresholds and notification settings rarely change and don't need a history with every temperature change.
+    _unrecorded_attributes = frozenset({"min_value", "max_value", "app_notifications"})
+
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
@@ -7,13 +7,14 @@ from collections.abc import Callable
 from dataclasses import dataclass
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from aquatlantis_ori import AquatlantisOriClient, Device, PowerType
+from aquatlantis_ori import Device, PowerType
 
-from .entity import OriEntity, OriEntityDescription
+from .commands import OriLightCommand
+from .coordinator import OriConfigEntry
+from .entity import OriEntity, OriEntityDescription, async_add_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 PARALLEL_UPDATES = 0
@@ -23,14 +24,15 @@ PARALLEL_UPDATES = 0
 class OriButtonEntityDescription(OriEntityDescription, ButtonEntityDescription):
     """Class describing Aquatlantis Ori button entities."""
 
-    press_fn: Callable[[Device], None]
+    command_fn: Callable[[Device], OriLightCommand]
 
 
 DESCRIPTIONS: list[OriButtonEntityDescription] = [
     OriButtonEntityDescription(
         key="custom1",
         translation_key="custom1",
-        press_fn=lambda device: device.set_light(PowerType.ON, device.custom1),
+        device_fields=frozenset({"custom1"}),
+        command_fn=lambda device: OriLightCommand(power=PowerType.ON, options=device.custom1),
         state_attributes_fn=lambda device: {
             "intensity": device.custom1.intensity if device.custom1 else None,
             "red": device.custom1.red if device.custom1 else None,
@@ -42,7 +44,8 @@ DESCRIPTIONS: list[OriButtonEntityDescription] = [
     OriButtonEntityDescription(
         key="custom2",
         translation_key="custom2",
-        press_fn=lambda device: device.set_light(PowerType.ON, device.custom2),
+        device_fields=frozenset({"custom2"}),
+        command_fn=lambda device: OriLightCommand(power=PowerType.ON, options=device.custom2),
         state_attributes_fn=lambda device: {
             "intensity": device.custom2.intensity if device.custom2 else None,
             "red": device.custom2.red if device.custom2 else None,
@@ -54,7 +57,8 @@ DESCRIPTIONS: list[OriButtonEntityDescription] = [
     OriButtonEntityDescription(
         key="custom3",
         translation_key="custom3",
-        press_fn=lambda device: device.set_light(PowerType.ON, device.custom3),
+        device_fields=frozenset({"custom3"}),
+        command_fn=lambda device: OriLightCommand(power=PowerType.ON, options=device.custom3),
         state_attributes_fn=lambda device: {
             "intensity": device.custom3.intensity if device.custom3 else None,
             "red": device.custom3.red if device.custom3 else None,
@@ -66,7 +70,8 @@ DESCRIPTIONS: list[OriButtonEntityDescription] = [
     OriButtonEntityDescription(
         key="custom4",
         translation_key="custom4",
-        press_fn=lambda device: device.set_light(PowerType.ON, device.custom4),
+        device_fields=frozenset({"custom4"}),
+        command_fn=lambda device: OriLightCommand(power=PowerType.ON, options=device.custom4),
         state_attributes_fn=lambda device: {
             "intensity": device.custom4.intensity if device.custom4 else None,
             "red": device.custom4.red if device.custom4 else None,
@@ -80,34 +85,20 @@ DESCRIPTIONS: list[OriButtonEntityDescription] = [
 
 async def async_setup_entry(
     _hass: HomeAssistant,
-    config_entry: ConfigEntry[AquatlantisOriClient],
+    config_entry: OriConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up a Aquatlantis Ori button entry."""
-    entities: list[ButtonEntity] = []
-
-    client = config_entry.runtime_data
-
-    for device in client.get_devices():
-        entities.extend(
-            [
-                OriButton(
-                    config_entry,
-                    description,
-                    device,
-                )
-                for description in DESCRIPTIONS
-                if description.is_supported_fn(device)
-            ]
-        )
-
-    async_add_entities(entities)
+    async_add_device_entities(config_entry, async_add_entities, (OriButton, DESCRIPTIONS))
 
 
 class OriButton(OriEntity[OriButtonEntityDescription], ButtonEntity):
     """Representation of a Aquatlantis Ori button."""
 
-    def press(self) -> None:
+    # The preset values are configuration, recording them with every press only fills the database.
+    _unrecorded_attributes = frozenset({"intensity", "red", "green", "blue", "white"})
+
+    async def async_press(self) -> None:
         """Handle the button press."""
         _LOGGER.info("Pressing button %s on device %s", self.description.key, self._device.devid)
-        self.description.press_fn(self._device)
+        self._config_entry.runtime_data.async_send_command(self._device, self.description.command_fn(self._device))
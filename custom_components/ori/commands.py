@@ -0,0 +1,220 @@
+"""Aquatlantis Ori commands."""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from aquatlantis_ori import Device, DynamicModeType, LightOptions, ModeType, PowerType, TimeCurve
+
+from .const import COMMAND_QUEUE_SIZE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Light options that are reported back by the device under the same name.
+LIGHT_CHANNELS = ("intensity", "red", "green", "blue", "white")
+
+# Device fields that report back the changes made by commands.
+COMMAND_FIELDS = frozenset({"is_light_on", "mode", "dynamic_mode", *LIGHT_CHANNELS, "timecurve"})
+
+
+@dataclass(kw_only=True)
+class OriCommandStats:
+    """Counters of the commands sent to the devices of a config entry."""
+
+    commands: int = 0
+    messages: int = 0
+    # Light channel changes that were merged into the command of another change.
+    coalesced: int = 0
+    # Queued commands that were dropped, because a newer command changes the same properties.
+    superseded: int = 0
+
+
+@dataclass(kw_only=True, frozen=True)
+class OriLightCommand:
+    """A light change, combining everything a single user action wants to change."""
+
+    mode: ModeType | None = None
+    dynamic_mode: DynamicModeType | None = None
+    power: PowerType | None = None
+    options: LightOptions | None = None
+
+    def messages(self, device: Device) -> list[Callable[[], None]]:
+        """Return the messages needed to apply the command to the device.
+
+        Modes the device already has are skipped, power and light options are sent together when turning on.
+        """
+        messages: list[Callable[[], None]] = []
+
+        if self.mode is not None and device.mode != self.mode:
+            messages.append(partial(device.set_mode, self.mode))
+        if self.dynamic_mode is not None and device.dynamic_mode != self.dynamic_mode:
+            messages.append(partial(device.set_dynamic_mode, self.dynamic_mode))
+
+        if self.power == PowerType.ON:
+            messages.append(partial(device.set_light, PowerType.ON, self.options or LightOptions()))
+        elif self.power is not None:
+            messages.append(partial(device.set_power, self.power))
+
+        return messages
+
+    def properties(self) -> frozenset[str]:
+        """Return the device properties the command changes."""
+        properties: set[str] = set()
+
+        if self.mode is not None:
+            properties.add("mode")
+        if self.dynamic_mode is not None:
+            properties.add("dynamic_mode")
+        if self.power is not None:
+            properties.add("power")
+        if self.options is not None:
+            properties.update(channel for channel in LIGHT_CHANNELS if getattr(self.options, channel) is not None)
+
+        return frozenset(properties)
+
+    def expected_state(self) -> dict[str, Any]:
+        """Return the device fields and the values they will have once the device applied the command."""
+        state: dict[str, Any] = {}
+
+        if self.mode is not None:
+            state["mode"] = self.mode
+        if self.dynamic_mode is not None:
+            state["dynamic_mode"] = self.dynamic_mode
+        if self.power is not None:
+            state["is_light_on"] = self.power == PowerType.ON
+        if self.options is not None:
+            state.update({channel: value for channel in LIGHT_CHANNELS if (value := getattr(self.options, channel)) is not None})
+
+        return state
+
+
+@dataclass(kw_only=True, frozen=True)
+class OriChannelCommand:
+    """Light channel changes, collected from the number entities."""
+
+    channels: dict[str, int]
+
+    def messages(self, device: Device) -> list[Callable[[], None]]:
+        """Return the messages needed to apply the command to the device.
+
+        Multiple channels are combined into a single light change, keeping the current power state.
+        """
+        if len(self.channels) == 1:
+            ((channel, value),) = self.channels.items()
+            return [partial(getattr(device, f"set_{channel}"), value)]
+
+        power = PowerType.ON if device.is_light_on else PowerType.OFF
+        return [partial(device.set_light, power, LightOptions(**self.channels))]
+
+    def properties(self) -> frozenset[str]:
+        """Return the device properties the command changes."""
+        return frozenset(self.channels)
+
+    def expected_state(self) -> dict[str, Any]:
+        """Return the device fields and the values they will have once the device applied the command."""
+        return dict(self.channels)
+
+
+@dataclass(kw_only=True, frozen=True)
+class OriScheduleCommand:
+    """A new light schedule."""
+
+    timecurves: list[TimeCurve]
+
+    def messages(self, device: Device) -> list[Callable[[], None]]:
+        """Return the messages needed to apply the command to the device."""
+        return [partial(device.set_timecurve, self.timecurves)]
+
+    def properties(self) -> frozenset[str]:
+        """Return the device properties the command changes."""
+        return frozenset({"timecurve"})
+
+    def expected_state(self) -> dict[str, Any]:
+        """Return the device fields and the values they will have once the device applied the command."""
+        return {"timecurve": self.timecurves}
+
+
+type OriCommand = OriLightCommand | OriChannelCommand | OriScheduleCommand
+
+
+class OriCommandQueue:
+    """Outbound commands of a single device, sent one by one and no faster than the command rate."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device: Device,
+        interval: float,
+        stats: OriCommandStats,
+        send: Callable[[Device, OriCommand], None],
+    ) -> None:
+        """Initialize the command queue."""
+        self._hass = hass
+        self._device = device
+        self._interval = interval
+        self._stats = stats
+        self._send = send
+        self._pending: deque[OriCommand] = deque()
+        self._last_sent: float | None = None
+        self._unsub_send: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_put(self, command: OriCommand, *, limit: bool = True) -> None:
+        """Queue a command, replacing the queued commands it supersedes.
+
+        Raises HomeAssistantError when the queue is full, so callers flooding a device notice it.
+        Commands without a limit are always queued, for commands that have no caller to notice it.
+        """
+        properties = command.properties()
+        pending = deque(queued for queued in self._pending if not queued.properties() <= properties)
+        self._stats.superseded += len(self._pending) - len(pending)
+        self._pending = pending
+
+        if limit and len(self._pending) >= COMMAND_QUEUE_SIZE:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="command_queue_full",
+                translation_placeholders={"device": self._device.name},
+            )
+
+        self._pending.append(command)
+        self._async_schedule()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop the queued commands."""
+        if self._unsub_send is not None:
+            self._unsub_send()
+            self._unsub_send = None
+        self._pending.clear()
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Send the next command now, or once the command rate allows it."""
+        if self._unsub_send is not None or not self._pending:
+            return
+
+        delay = 0.0 if self._last_sent is None else self._last_sent + self._interval - self._hass.loop.time()
+        if delay <= 0:
+            self._async_send_next()
+        else:
+            _LOGGER.debug("Delaying %d command(s) for device %s by %.2f seconds", len(self._pending), self._device.devid, delay)
+            self._unsub_send = async_call_later(self._hass, delay, self._async_send_next)
+
+    @callback
+    def _async_send_next(self, _now: datetime | None = None) -> None:
+        """Send the oldest queued command."""
+        self._unsub_send = None
+        self._last_sent = self._hass.loop.time()
+        self._send(self._device, self._pending.popleft())
+        self._async_schedule()
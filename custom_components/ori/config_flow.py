@@ -6,10 +6,18 @@ import logging
 from typing import Any
 
 import voluptuous as vol
-from homeassistant.config_entries import SOURCE_RECONFIGURE, ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import SOURCE_RECONFIGURE, ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.selector import TextSelector, TextSelectorConfig, TextSelectorType
+from homeassistant.helpers.selector import (
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    TextSelector,
+    TextSelectorConfig,
+    TextSelectorType,
+)
 
 from aquatlantis_ori import (
     AquatlantisOriClient,
@@ -19,7 +27,7 @@ from aquatlantis_ori import (
     AquatlantisOriTimeoutError,
 )
 
-from .const import DOMAIN
+from .const import CONF_COMMAND_RATE, CONF_COMMAND_WINDOW, DEFAULT_COMMAND_RATE, DEFAULT_COMMAND_WINDOW, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 CONFIG_SCHEMA = vol.Schema(
@@ -28,6 +36,16 @@ CONFIG_SCHEMA = vol.Schema(
         vol.Required(CONF_PASSWORD): TextSelector(TextSelectorConfig(type=TextSelectorType.PASSWORD)),
     },
 )
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_COMMAND_WINDOW, default=DEFAULT_COMMAND_WINDOW): NumberSelector(
+            NumberSelectorConfig(min=0, max=2000, step=10, unit_of_measurement="ms", mode=NumberSelectorMode.BOX)
+        ),
+        vol.Required(CONF_COMMAND_RATE, default=DEFAULT_COMMAND_RATE): NumberSelector(
+            NumberSelectorConfig(min=0, max=20, step=1, unit_of_measurement="commands/s", mode=NumberSelectorMode.BOX)
+        ),
+    },
+)
 
 
 class OriConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -35,6 +53,12 @@ class OriConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(_config_entry: ConfigEntry) -> OriOptionsFlow:
+        """Get the options flow for this handler."""
+        return OriOptionsFlow()
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Handle the initial step."""
         errors = {}
@@ -84,3 +108,17 @@ class OriConfigFlow(ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=self.add_suggested_values_to_schema(CONFIG_SCHEMA, data),
         )
+
+
+class OriOptionsFlow(OptionsFlow):
+    """Handle the options for Aquatlantis Ori."""
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(OPTIONS_SCHEMA, self.config_entry.options),
+        )
@@ -1,5 +1,38 @@
 """Constants."""
 
+from datetime import timedelta
 from typing import Final
 
 DOMAIN: Final = "ori"
+
+# Availability is derived from the time since the last message, so it can change without any data being pushed.
+REFRESH_INTERVAL: Final = timedelta(minutes=1)
+
+# Time to wait for the first data of a device, before creating its entities without it.
+READY_TIMEOUT: Final = timedelta(seconds=30)
+
+STORAGE_VERSION: Final = 1
+STORAGE_SAVE_DELAY: Final = 10
+
+# Window in which pushed updates of a device are collected into a single state write per entity.
+UPDATE_COOLDOWN: Final = 0.1
+
+# Light channel changes within this window (in milliseconds) are sent to the device together.
+CONF_COMMAND_WINDOW: Final = "command_window"
+DEFAULT_COMMAND_WINDOW: Final = 100
+
+# Time the device gets to confirm a change, before the optimistic state of an entity is rolled back.
+OPTIMISTIC_TIMEOUT: Final = timedelta(seconds=10)
+
+# Maximum number of commands per second sent to a single device, 0 disables the limit.
+CONF_COMMAND_RATE: Final = "command_rate"
+DEFAULT_COMMAND_RATE: Final = 5
+
+# Commands waiting to be sent to a single device, before new commands are rejected.
+COMMAND_QUEUE_SIZE: Final = 10
+
+# Number of recent command round trips kept per device for the latency percentiles.
+LATENCY_SAMPLES: Final = 100
+
+# Commands that are not reported back by the device within this time are counted as unconfirmed.
+LATENCY_TIMEOUT: Final = timedelta(seconds=60)
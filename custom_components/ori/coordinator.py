@@ -0,0 +1,352 @@
+"""Aquatlantis Ori coordinator."""
+
+from __future__ import annotations
+
+import copy
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial, wraps
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util.hass_dict import HassKey
+
+from aquatlantis_ori import AquatlantisOriClient, Device
+
+from .commands import OriChannelCommand, OriCommand, OriCommandQueue, OriCommandStats
+from .const import (
+    CONF_COMMAND_RATE,
+    CONF_COMMAND_WINDOW,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_COMMAND_WINDOW,
+    DOMAIN,
+    READY_TIMEOUT,
+    REFRESH_INTERVAL,
+    UPDATE_COOLDOWN,
+)
+from .latency import OriCommandLatency
+from .store import OriDeviceSnapshot, OriSnapshotStore
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device methods the client calls when new data is pushed by the cloud.
+PUSH_METHODS = ("update_mqtt_data", "update_firmware_data")
+
+type OriConfigEntry = ConfigEntry[OriCoordinator]
+
+# Config entry and data of the devices of all config entries, by device id, so services don't have to search for them.
+DATA_DEVICES: HassKey[dict[str, tuple[OriConfigEntry, Device]]] = HassKey(DOMAIN)
+
+
+def _has_data(device: Device) -> bool:
+    """Return True when the first full payload of a device has been received."""
+    # The light type is only known from pushed data and decides which entities are created.
+    return device.light_type is not None
+
+
+class OriCoordinator:
+    """Distribute pushed device data to the entities of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, config_entry: OriConfigEntry, client: AquatlantisOriClient) -> None:
+        """Initialize the coordinator."""
+        self.hass = hass
+        self.client = client
+        self.store = OriSnapshotStore(hass, config_entry.entry_id)
+        self.command_stats = OriCommandStats()
+        self.command_latency: dict[str, OriCommandLatency] = {}
+        self._config_entry = config_entry
+        self._command_window = config_entry.options.get(CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW) / 1000
+        command_rate = config_entry.options.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE)
+        self._command_interval = 1 / command_rate if command_rate else 0.0
+        self._command_queues: dict[str, OriCommandQueue] = {}
+        self._pending_channels: dict[str, dict[str, int]] = {}
+        self._unsub_pending_channels: dict[str, CALLBACK_TYPE] = {}
+        self._devices: dict[str, Device] = {}
+        self._ready_devices: set[str] = set()
+        # Devices that got entities without data, based on their stored snapshot.
+        self._unconfirmed_devices: set[str] = set()
+        self._device_listeners: list[Callable[[list[Device]], None]] = []
+        # Index from device field to the listeners reading it, per device.
+        self._listeners: dict[str, dict[str, list[CALLBACK_TYPE]]] = {}
+        # Last known value of the fields that have listeners, per device. Copies, the client may change lists in place.
+        self._values: dict[str, dict[str, Any]] = {}
+        self._debouncers: dict[str, Debouncer[None]] = {}
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        self._unsub_ready_timeout: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening for pushed device data."""
+        for device in self.client.get_devices():
+            self._hook_device(device)
+
+        self._async_announce_devices(
+            [device for device in self._devices.values() if _has_data(device) or self.store.async_get(device.id) is not None]
+        )
+        if len(self._ready_devices) < len(self._devices):
+            self._unsub_ready_timeout = async_call_later(self.hass, READY_TIMEOUT, self._async_ready_timeout)
+
+        self._unsub_refresh = async_track_time_interval(self.hass, self._async_refresh, REFRESH_INTERVAL)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening for pushed device data."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+        if self._unsub_ready_timeout is not None:
+            self._unsub_ready_timeout()
+            self._unsub_ready_timeout = None
+
+        for debouncer in self._debouncers.values():
+            debouncer.async_shutdown()
+        self._debouncers.clear()
+
+        for unsub in self._unsub_pending_channels.values():
+            unsub()
+        self._unsub_pending_channels.clear()
+        self._pending_channels.clear()
+
+        for queue in self._command_queues.values():
+            queue.async_shutdown()
+        self._command_queues.clear()
+
+        devices = self.hass.data.get(DATA_DEVICES, {})
+        for device in self._devices.values():
+            for name in PUSH_METHODS:
+                delattr(device, name)
+            # The device may have moved to another config entry, that then owns the entry.
+            if device.id in devices and devices[device.id][0] is self._config_entry:
+                del devices[device.id]
+        self._devices.clear()
+        self._ready_devices.clear()
+        self._unconfirmed_devices.clear()
+
+    @callback
+    def async_add_device_listener(self, device_callback: Callable[[list[Device]], None]) -> CALLBACK_TYPE:
+        """Listen for devices that are ready to create entities for.
+
+        The callback is called right away with the devices that are already ready.
+        """
+        self._device_listeners.append(device_callback)
+        device_callback([self._devices[device_id] for device_id in self._ready_devices])
+
+        @callback
+        def remove_listener() -> None:
+            """Remove device listener."""
+            self._device_listeners.remove(device_callback)
+
+        return remove_listener
+
+    @callback
+    def async_get_snapshot(self, device: Device) -> OriDeviceSnapshot:
+        """Return the static fields of a device, the stored ones are used until data is received."""
+        if device.id in self._unconfirmed_devices and (snapshot := self.store.async_get(device.id)) is not None:
+            return snapshot
+
+        return OriDeviceSnapshot.from_device(device)
+
+    @callback
+    def async_add_listener(self, device_id: str, fields: frozenset[str], update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for changes of the given fields of a single device."""
+        device = self._devices[device_id]
+        field_listeners = self._listeners.setdefault(device_id, {})
+        values = self._values.setdefault(device_id, {})
+        for field in fields:
+            field_listeners.setdefault(field, []).append(update_callback)
+            if field not in values:
+                values[field] = copy.deepcopy(getattr(device, field))
+
+        @callback
+        def remove_listener() -> None:
+            """Remove update listener."""
+            for field in fields:
+                field_listeners[field].remove(update_callback)
+                if not field_listeners[field]:
+                    del field_listeners[field]
+                    values.pop(field, None)
+
+        return remove_listener
+
+    @callback
+    def async_send_command(self, device: Device, command: OriCommand, *, limit: bool = True) -> None:
+        """Queue a command for a device.
+
+        Commands are sent one by one, no faster than the command rate, and replace queued commands changing the same properties.
+        Collected light channel changes are queued first, so they can't be sent after a later command.
+        Raises HomeAssistantError when too many commands are waiting, unless the limit is turned off.
+        """
+        if not isinstance(command, OriChannelCommand):
+            self._async_send_light_channels(device)
+        if (queue := self._command_queues.get(device.id)) is None:
+            queue = self._command_queues[device.id] = OriCommandQueue(
+                self.hass, device, self._command_interval, self.command_stats, self._async_send_command
+            )
+        queue.async_put(command, limit=limit)
+
+    @callback
+    def async_set_light_channel(self, device: Device, channel: str, value: int) -> None:
+        """Set a light channel of a device.
+
+        Channel changes within the command window are collected, so they are sent to the device together.
+        """
+        channels = self._pending_channels.setdefault(device.id, {})
+        if channels:
+            self.command_stats.coalesced += 1
+        channels[channel] = value
+
+        if not self._command_window:
+            self._async_send_light_channels(device)
+        elif device.id not in self._unsub_pending_channels:
+            self._unsub_pending_channels[device.id] = async_call_later(
+                self.hass, self._command_window, partial(self._async_send_light_channels, device)
+            )
+
+    @callback
+    def _async_send_light_channels(self, device: Device, _now: datetime | None = None) -> None:
+        """Send the collected light channel changes of a device."""
+        if (unsub := self._unsub_pending_channels.pop(device.id, None)) is not None:
+            unsub()
+        if channels := self._pending_channels.pop(device.id, None):
+            # Sent from a timer or ahead of another command, so there is no caller to report a full queue to.
+            self.async_send_command(device, OriChannelCommand(channels=channels), limit=False)
+
+    @callback
+    def _async_send_command(self, device: Device, command: OriCommand) -> None:
+        """Send a command to a device.
+
+        Publishing a message doesn't block, so commands are sent from the event loop and don't need the executor.
+        The protocol doesn't acknowledge commands, the result is pushed by the device like any other update.
+        """
+        messages = command.messages(device)
+        # Values the device already has won't be reported as a change, so they can't be timed.
+        expected_state = {field: value for field, value in command.expected_state().items() if getattr(device, field) != value}
+        _LOGGER.debug("Sending %s to device %s in %d message(s)", command, device.devid, len(messages))
+        for message in messages:
+            message()
+
+        self.command_stats.commands += 1
+        self.command_stats.messages += len(messages)
+        if expected_state:
+            self.command_latency[device.id].sent(expected_state, time.monotonic())
+
+    @callback
+    def _async_handle_push(self, device_id: str, received_at: float) -> None:
+        """Handle data pushed by a device."""
+        if (device := self._devices.get(device_id)) is not None:
+            self.command_latency[device_id].pushed(device, received_at)
+
+        self.async_update_device(device_id)
+
+    @callback
+    def async_update_device(self, device_id: str) -> None:
+        """Schedule notifying the listeners of a device that its data changed.
+
+        Updates that arrive within the cooldown are collected, so each entity writes its state once.
+        """
+        if device_id in self._unconfirmed_devices:
+            self._async_reconcile_device(self._devices[device_id])
+
+        if device_id not in self._ready_devices:
+            if (device := self._devices.get(device_id)) is not None and _has_data(device):
+                self._async_announce_devices([device])
+            return
+
+        if (debouncer := self._debouncers.get(device_id)) is None:
+            debouncer = self._debouncers[device_id] = Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=UPDATE_COOLDOWN,
+                immediate=False,
+                function=partial(self._async_notify_listeners, device_id),
+            )
+        debouncer.async_schedule_call()
+
+    @callback
+    def _async_notify_listeners(self, device_id: str) -> None:
+        """Notify the listeners of the device fields that changed."""
+        if (device := self._devices.get(device_id)) is None:
+            return
+
+        values = self._values.get(device_id, {})
+        # A dict keeps the order and makes sure every listener is only called once.
+        update_callbacks: dict[CALLBACK_TYPE, None] = {}
+        for field, listeners in self._listeners.get(device_id, {}).items():
+            if (value := getattr(device, field)) != values[field]:
+                values[field] = copy.deepcopy(value)
+                update_callbacks.update(dict.fromkeys(listeners))
+
+        for update_callback in update_callbacks:
+            update_callback()
+
+    @callback
+    def _async_announce_devices(self, devices: list[Device]) -> None:
+        """Let the platforms create entities for devices that are ready."""
+        if not devices:
+            return
+
+        for device in devices:
+            _LOGGER.debug("Device %s is ready", device.devid)
+            self._ready_devices.add(device.id)
+            if _has_data(device):
+                self.store.async_set(device.id, OriDeviceSnapshot.from_device(device))
+            else:
+                self._unconfirmed_devices.add(device.id)
+
+        for device_callback in list(self._device_listeners):
+            device_callback(devices)
+
+    @callback
+    def _async_reconcile_device(self, device: Device) -> None:
+        """Compare the live data of a device, that got entities without data, with its stored snapshot."""
+        if not _has_data(device):
+            return
+
+        self._unconfirmed_devices.discard(device.id)
+        if self.store.async_set(device.id, OriDeviceSnapshot.from_device(device)):
+            # The supported entities might be different now, reload so they are created again.
+            _LOGGER.info("Device %s changed since its last snapshot, reloading", device.devid)
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+
+    @callback
+    def _async_ready_timeout(self, _now: datetime) -> None:
+        """Announce the devices that didn't receive data in time, so they aren't left without entities."""
+        self._unsub_ready_timeout = None
+        late_devices = [device for device_id, device in self._devices.items() if device_id not in self._ready_devices]
+        for device in late_devices:
+            _LOGGER.warning("No data received for device %s, its entities might be incomplete", device.devid)
+
+        self._async_announce_devices(late_devices)
+
+    @callback
+    def _async_refresh(self, _now: datetime) -> None:
+        """Check all devices for changes, so derived state like availability is refreshed."""
+        for device_id in list(self._listeners):
+            self.async_update_device(device_id)
+
+    def _hook_device(self, device: Device) -> None:
+        """Wrap the push methods of a device, so we get notified when the client updates it."""
+        for name in PUSH_METHODS:
+            setattr(device, name, self._wrap_push_method(device, getattr(device, name)))
+        self._devices[device.id] = device
+        self.hass.data.setdefault(DATA_DEVICES, {})[device.id] = (self._config_entry, device)
+        self.command_latency.setdefault(device.id, OriCommandLatency())
+        _LOGGER.debug("Listening for pushed data of device %s", device.devid)
+
+    def _wrap_push_method(self, device: Device, method: Callable[..., None]) -> Callable[..., None]:
+        """Return a wrapper that notifies the listeners after the device got updated."""
+
+        @wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+            method(*args, **kwargs)
+            # The MQTT client runs in its own thread, hand the notification over to the event loop.
+            # The receive time is taken here, so the command latency doesn't include waiting for the event loop.
+            self.hass.loop.call_soon_threadsafe(self._async_handle_push, device.id, time.monotonic())
+
+        return wrapper
@@ -3,17 +3,22 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Any, cast
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
-from aquatlantis_ori import AquatlantisOriClient, AvailabilityType, Device
+from aquatlantis_ori import AvailabilityType, Device
 
-from .const import DOMAIN
+from .const import DOMAIN, OPTIMISTIC_TIMEOUT
+from .coordinator import OriConfigEntry
+from .store import OriDeviceSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,9 +27,11 @@ _LOGGER = logging.getLogger(__name__)
 class OriEntityDescription(EntityDescription):
     """Class describing Aquatlantis Ori entities."""
 
+    # Device fields read by the entity, the entity state is only written when one of them changes.
+    device_fields: frozenset[str]
     available_fn: Callable[[Device], bool] = lambda _: True
     entity_registry_enabled_default_fn: Callable[[Device], bool] = lambda _: True
-    is_supported_fn: Callable[[Device], bool] = lambda _: True
+    is_supported_fn: Callable[[OriDeviceSnapshot], bool] = lambda _: True
     state_attributes_fn: Callable[[Device], dict[str, Any]] = lambda _: {}
 
 
@@ -32,10 +39,13 @@ class OriEntity[DescriptionT: OriEntityDescription](Entity):
     """Representation of a Aquatlantis Ori entity."""
 
     _attr_has_entity_name = True
+    _attr_should_poll = False
+    # Device fields read by every entity, see available.
+    _device_fields = frozenset({"availability_state"})
 
     def __init__(
         self,
-        config_entry: ConfigEntry[AquatlantisOriClient],
+        config_entry: OriConfigEntry,
         description: DescriptionT,
         device: Device,
     ) -> None:
@@ -47,6 +57,9 @@ class OriEntity[DescriptionT: OriEntityDescription](Entity):
         self._attr_unique_id = f"{device.id}_{description.key}".lower()
         self._config_entry = config_entry
         self._device = device
+        # Requested device values that are shown until the device confirms them.
+        self._optimistic_state: dict[str, Any] = {}
+        self._unsub_optimistic_timeout: CALLBACK_TYPE | None = None
         self._attr_device_info = DeviceInfo(
             name=device.name,
             identifiers={(DOMAIN, str(device.id))},
@@ -57,6 +70,79 @@ class OriEntity[DescriptionT: OriEntityDescription](Entity):
             sw_version=device.version,
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to changes of the device fields read by the entity."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._config_entry.runtime_data.async_add_listener(
+                self._device.id,
+                self._device_fields | self.description.device_fields,
+                self._handle_device_update,
+            )
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the optimistic state timeout."""
+        await super().async_will_remove_from_hass()
+        self._async_clear_optimistic_state()
+
+    @callback
+    def _handle_device_update(self) -> None:
+        """Handle pushed data of the device."""
+        if self._optimistic_state:
+            # Values the device reports as requested are confirmed, others might still be on their way.
+            self._optimistic_state = {field: value for field, value in self._optimistic_state.items() if getattr(self._device, field) != value}
+            if not self._optimistic_state:
+                self._async_clear_optimistic_state()
+
+        self.async_write_ha_state()
+
+    @callback
+    def _async_set_optimistic_state(self, state: dict[str, Any]) -> None:
+        """Show the requested device values right away, until the device confirms them or the timeout passes."""
+        for field, value in state.items():
+            # Requesting the reported value again replaces an earlier request that is still shown.
+            if getattr(self._device, field) == value:
+                self._optimistic_state.pop(field, None)
+            else:
+                self._optimistic_state[field] = value
+
+        if self._optimistic_state:
+            if self._unsub_optimistic_timeout is not None:
+                self._unsub_optimistic_timeout()
+            self._unsub_optimistic_timeout = async_call_later(self.hass, OPTIMISTIC_TIMEOUT, self._async_optimistic_state_timeout)
+        else:
+            self._async_clear_optimistic_state()
+
+        self.async_write_ha_state()
+
+    @callback
+    def _async_clear_optimistic_state(self) -> None:
+        """Drop the optimistic state and its timeout."""
+        self._optimistic_state = {}
+        if self._unsub_optimistic_timeout is not None:
+            self._unsub_optimistic_timeout()
+            self._unsub_optimistic_timeout = None
+
+    @callback
+    def _async_optimistic_state_timeout(self, _now: datetime) -> None:
+        """Roll back to the device state, the requested values were not confirmed in time."""
+        self._unsub_optimistic_timeout = None
+        _LOGGER.warning(
+            "Device %s did not confirm %s for %s, rolling back to the reported state",
+            self._device.devid,
+            ", ".join(sorted(self._optimistic_state)),
+            self.entity_id,
+        )
+        self._optimistic_state = {}
+        self.async_write_ha_state()
+
+    def _device_value(self, field: str) -> Any:  # noqa: ANN401
+        """Return the value of a device field, preferring the optimistic state."""
+        if field in self._optimistic_state:
+            return self._optimistic_state[field]
+        return getattr(self._device, field)
+
     @property
     def description(self) -> DescriptionT:
         """Return the typed entity description."""
@@ -71,3 +157,33 @@ class OriEntity[DescriptionT: OriEntityDescription](Entity):
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
         return self.description.state_attributes_fn(self._device)
+
+
+@callback
+def async_add_device_entities(
+    config_entry: OriConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+    *entity_types: tuple[Callable[[OriConfigEntry, Any, Device], Entity], Sequence[OriEntityDescription]],
+) -> None:
+    """Add the supported entities of each device, as soon as the device is ready.
+
+    Each entity type is an entity class together with the descriptions to create it for.
+    """
+
+    @callback
+    def async_add_devices(devices: list[Device]) -> None:
+        """Add entities for devices that are ready."""
+        entities: list[Entity] = []
+
+        for device in devices:
+            snapshot = config_entry.runtime_data.async_get_snapshot(device)
+            entities.extend(
+                entity_class(config_entry, description, device)
+                for entity_class, descriptions in entity_types
+                for description in descriptions
+                if description.is_supported_fn(snapshot)
+            )
+
+        async_add_entities(entities)
+
+    config_entry.async_on_unload(config_entry.runtime_data.async_add_device_listener(async_add_devices))
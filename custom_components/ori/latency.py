@@ -0,0 +1,62 @@
+"""Aquatlantis Ori command latency."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+from aquatlantis_ori import Device
+
+from .const import LATENCY_SAMPLES, LATENCY_TIMEOUT
+
+
+class OriCommandLatency:
+    """Round trip times of the commands sent to a single device, until the device reports the change."""
+
+    def __init__(self) -> None:
+        """Initialize the command latency."""
+        # Send time and expected device values of the commands that are not reported back yet.
+        self._waiting: deque[tuple[float, dict[str, Any]]] = deque()
+        self._samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.unconfirmed = 0
+
+    def sent(self, expected_state: dict[str, Any], sent_at: float) -> None:
+        """Start timing a command, until the device reports the expected values."""
+        # The device may never push data, so commands that timed out are also dropped here. They are waiting in send order.
+        while self._waiting and sent_at - self._waiting[0][0] > LATENCY_TIMEOUT.total_seconds():
+            self._waiting.popleft()
+            self.unconfirmed += 1
+        self._waiting.append((sent_at, expected_state))
+
+    def pushed(self, device: Device, received_at: float) -> None:
+        """Stop timing the commands that are reflected by the data pushed by the device."""
+        waiting: deque[tuple[float, dict[str, Any]]] = deque()
+        for sent_at, expected_state in self._waiting:
+            if all(getattr(device, field) == value for field, value in expected_state.items()):
+                self._samples.append(received_at - sent_at)
+            elif received_at - sent_at > LATENCY_TIMEOUT.total_seconds():
+                self.unconfirmed += 1
+            else:
+                waiting.append((sent_at, expected_state))
+        self._waiting = waiting
+
+    def percentile(self, percentile: int) -> float | None:
+        """Return a percentile of the recent round trips in milliseconds, using the nearest rank."""
+        if not self._samples:
+            return None
+
+        samples = sorted(self._samples)
+        rank = max(math.ceil(percentile / 100 * len(samples)), 1)
+        return round(samples[rank - 1] * 1000, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the latency as a dict, for diagnostics."""
+        return {
+            "samples": len(self._samples),
+            "waiting": len(self._waiting),
+            "unconfirmed": self.unconfirmed,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from datetime import timedelta
 from typing import Any
 
 from homeassistant.components.light import (
@@ -16,17 +15,17 @@ from homeassistant.components.light import (
     LightEntityDescription,
     LightEntityFeature,
 )
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from aquatlantis_ori import AquatlantisOriClient, Device, DynamicModeType, LightOptions, ModeType, PowerType
+from aquatlantis_ori import Device, DynamicModeType, LightOptions, ModeType, PowerType
 
-from .entity import OriEntity, OriEntityDescription
+from .commands import OriLightCommand
+from .coordinator import OriConfigEntry
+from .entity import OriEntity, OriEntityDescription, async_add_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 PARALLEL_UPDATES = 0
-SCAN_INTERVAL = timedelta(seconds=2)
 
 EFFECT_MANUAL = "manual"
 EFFECT_AUTOMATIC = "automatic"
@@ -34,34 +33,16 @@ EFFECT_DYNAMIC = "dynamic"
 EFFECT_LIST = [EFFECT_MANUAL, EFFECT_AUTOMATIC, EFFECT_DYNAMIC]
 
 
-def _effect_name(device: Device) -> str:
-    """Get the effect name for the device."""
-    if device.mode == ModeType.AUTOMATIC:
+def _effect_name(mode: ModeType | None, dynamic_mode: DynamicModeType | None) -> str:
+    """Get the effect name for the device modes."""
+    if mode == ModeType.AUTOMATIC:
         return EFFECT_AUTOMATIC
-    if device.dynamic_mode == DynamicModeType.ON:
+    if dynamic_mode == DynamicModeType.ON:
         return EFFECT_DYNAMIC
 
     return EFFECT_MANUAL
 
 
-def _schedule(device: Device) -> dict[str, dict[str, int]] | None:
-    """Get the light schedule for the device."""
-    if device.timecurve is None:
-        return None
-
-    schedule: dict[str, dict[str, int]] = {}
-    for curve in device.timecurve:
-        schedule[f"{curve.hour:>02}:{curve.minute:>02}"] = {
-            "intensity": curve.intensity,
-            "red": curve.red,
-            "green": curve.green,
-            "blue": curve.blue,
-            "white": curve.white,
-        }
-
-    return schedule
-
-
 def _convert_255_to_100(value: int) -> int:
     """Convert value from 0-255 range to 0-100 range."""
     return round((value * 100) / 255)
@@ -72,6 +53,33 @@ def _convert_100_to_255(value: int) -> int:
     return round((value * 255) / 100)
 
 
+def turn_on_command(kwargs: dict[str, Any]) -> OriLightCommand:
+    """Build a single light command from the turn on arguments."""
+    effect = kwargs.get(ATTR_EFFECT)
+    if effect == EFFECT_AUTOMATIC:
+        # Automatic mode does not require RGBW settings and changing power.
+        return OriLightCommand(mode=ModeType.AUTOMATIC, dynamic_mode=DynamicModeType.OFF)
+
+    options = LightOptions()
+
+    if ATTR_RGBW_COLOR in kwargs:
+        rgbw = kwargs[ATTR_RGBW_COLOR]
+        options.red = _convert_255_to_100(rgbw[0])
+        options.green = _convert_255_to_100(rgbw[1])
+        options.blue = _convert_255_to_100(rgbw[2])
+        options.white = _convert_255_to_100(rgbw[3])
+
+    if ATTR_BRIGHTNESS in kwargs:
+        options.intensity = _convert_255_to_100(kwargs.get(ATTR_BRIGHTNESS, 0))
+
+    if effect == EFFECT_MANUAL:
+        return OriLightCommand(mode=ModeType.MANUAL, dynamic_mode=DynamicModeType.OFF, power=PowerType.ON, options=options)
+    if effect == EFFECT_DYNAMIC:
+        return OriLightCommand(mode=ModeType.MANUAL, dynamic_mode=DynamicModeType.ON, power=PowerType.ON, options=options)
+
+    return OriLightCommand(power=PowerType.ON, options=options)
+
+
 @dataclass(kw_only=True, frozen=True)
 class OriLightEntityDescription(OriEntityDescription, LightEntityDescription):
     """Class describing Aquatlantis Ori light entities."""
@@ -81,38 +89,18 @@ DESCRIPTIONS: list[OriLightEntityDescription] = [
     OriLightEntityDescription(
         key="light",
         translation_key="light",
-        state_attributes_fn=lambda device: {
-            "light_mode": _effect_name(device),
-            "schedule": _schedule(device),
-        },
+        device_fields=frozenset({"is_light_on", "mode", "dynamic_mode", "intensity", "red", "green", "blue", "white"}),
     ),
 ]
 
 
 async def async_setup_entry(
     _hass: HomeAssistant,
-    config_entry: ConfigEntry[AquatlantisOriClient],
+    config_entry: OriConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up a Aquatlantis Ori light entry."""
-    entities: list[LightEntity] = []
-
-    client = config_entry.runtime_data
-
-    for device in client.get_devices():
-        entities.extend(
-            [
-                OriLightEntity(
-                    config_entry,
-                    description,
-                    device,
-                )
-                for description in DESCRIPTIONS
-                if description.is_supported_fn(device)
-            ]
-        )
-
-    async_add_entities(entities)
+    async_add_device_entities(config_entry, async_add_entities, (OriLightEntity, DESCRIPTIONS))
 
 
 class OriLightEntity(OriEntity[OriLightEntityDescription], LightEntity):
@@ -120,7 +108,7 @@ class OriLightEntity(OriEntity[OriLightEntityDescription], LightEntity):
 
     def __init__(
         self,
-        config_entry: ConfigEntry[AquatlantisOriClient],
+        config_entry: OriConfigEntry,
         description: OriLightEntityDescription,
         device: Device,
     ) -> None:
@@ -129,51 +117,34 @@ class OriLightEntity(OriEntity[OriLightEntityDescription], LightEntity):
         self._attr_effect_list = EFFECT_LIST
         self._attr_supported_features |= LightEntityFeature.EFFECT
 
-    def turn_on(self, **kwargs: Any) -> None:  # noqa: ANN401
+    async def async_turn_on(self, **kwargs: Any) -> None:  # noqa: ANN401
         """Turn the entity on."""
         _LOGGER.info("Turning on, or changing light %s on device %s", self.description.key, self._device.devid)
-        options = LightOptions()
-
-        if ATTR_EFFECT in kwargs:
-            effect = kwargs[ATTR_EFFECT]
-            if effect == EFFECT_MANUAL:
-                self._device.set_mode(ModeType.MANUAL)
-                self._device.set_dynamic_mode(DynamicModeType.OFF)
-            elif effect == EFFECT_AUTOMATIC:
-                self._device.set_mode(ModeType.AUTOMATIC)
-                self._device.set_dynamic_mode(DynamicModeType.OFF)
-                return  # No need to continue, automatic mode does not require RGBW settings and changing power
-            elif effect == EFFECT_DYNAMIC:
-                self._device.set_mode(ModeType.MANUAL)
-                self._device.set_dynamic_mode(DynamicModeType.ON)
-
-        if ATTR_RGBW_COLOR in kwargs:
-            rgbw = kwargs[ATTR_RGBW_COLOR]
-            options.red = _convert_255_to_100(rgbw[0])
-            options.green = _convert_255_to_100(rgbw[1])
-            options.blue = _convert_255_to_100(rgbw[2])
-            options.white = _convert_255_to_100(rgbw[3])
-
-        if ATTR_BRIGHTNESS in kwargs:
-            options.intensity = _convert_255_to_100(kwargs.get(ATTR_BRIGHTNESS, 0))
-
-        self._device.set_light(PowerType.ON, options)
-
-    def turn_off(self, **_kwargs: Any) -> None:  # noqa: ANN401
+        command = turn_on_command(kwargs)
+        self._config_entry.runtime_data.async_send_command(self._device, command)
+        self._async_set_optimistic_state(command.expected_state())
+
+    async def async_turn_off(self, **_kwargs: Any) -> None:  # noqa: ANN401
         """Turn the entity off."""
         _LOGGER.info("Turning off light %s on device %s", self.description.key, self._device.devid)
-        self._device.set_mode(ModeType.MANUAL)
-        self._device.set_power(PowerType.OFF)
+        command = OriLightCommand(mode=ModeType.MANUAL, power=PowerType.OFF)
+        self._config_entry.runtime_data.async_send_command(self._device, command)
+        self._async_set_optimistic_state(command.expected_state())
 
     @property
     def effect(self) -> str | None:
         """Return the current effect."""
-        return _effect_name(self._device)
+        return _effect_name(self._device_value("mode"), self._device_value("dynamic_mode"))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        return {"light_mode": self.effect}
 
     @property
     def color_mode(self) -> ColorMode | None:
         """Return the color mode of the light."""
-        if self._device.mode == ModeType.AUTOMATIC or self._device.dynamic_mode == DynamicModeType.ON:
+        if self.effect != EFFECT_MANUAL:
             # If the device is in automatic mode or dynamic mode is on, it only supports ON/OFF
             return ColorMode.ONOFF
         return ColorMode.RGBW
@@ -181,7 +152,7 @@ class OriLightEntity(OriEntity[OriLightEntityDescription], LightEntity):
     @property
     def supported_color_modes(self) -> set[ColorMode] | None:
         """Flag supported color modes."""
-        if self._device.mode == ModeType.AUTOMATIC or self._device.dynamic_mode == DynamicModeType.ON:
+        if self.effect != EFFECT_MANUAL:
             # If the device is in automatic mode or dynamic mode is on, it only supports ON/OFF
             return {ColorMode.ONOFF}
         return {ColorMode.RGBW}
@@ -189,22 +160,25 @@ class OriLightEntity(OriEntity[OriLightEntityDescription], LightEntity):
     @property
     def is_on(self) -> bool:
         """Return true if device is on."""
-        return self._device.is_light_on
+        return bool(self._device_value("is_light_on"))
 
     @property
-    def brightness(self) -> int:
+    def brightness(self) -> int | None:
         """Return the brightness of the light."""
-        intensity = getattr(self._device, "intensity", 0)
+        if (intensity := self._device_value("intensity")) is None:
+            return None
 
         return _convert_100_to_255(intensity)
 
     @property
     def rgbw_color(self) -> tuple[int, int, int, int] | None:
         """Return the rgbw color value [int, int, int, int]."""
-        red = getattr(self._device, "red", 0)
-        green = getattr(self._device, "green", 0)
-        blue = getattr(self._device, "blue", 0)
-        white = getattr(self._device, "white", 0)
+        red = self._device_value("red")
+        green = self._device_value("green")
+        blue = self._device_value("blue")
+        white = self._device_value("white")
+        if red is None or green is None or blue is None or white is None:
+            return None
 
         return (
             _convert_100_to_255(red),
@@ -0,0 +1,100 @@
+"""Aquatlantis Ori schedule."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from functools import cached_property
+
+from aquatlantis_ori import TimeCurve
+
+MINUTES_PER_DAY = 24 * 60
+
+# Light channels of a time curve, all percentages.
+SCHEDULE_CHANNELS = ("intensity", "red", "green", "blue", "white")
+
+
+@dataclass(frozen=True)
+class OriScheduleTable:
+    """Light output for every minute of the day, following the schedule of a device."""
+
+    channels: dict[str, array[int]]
+
+    @classmethod
+    def from_timecurve(cls, timecurve: list[TimeCurve]) -> OriScheduleTable:
+        """Interpolate the time curve linearly between its points, wrapping around midnight."""
+        # A later point at the same time replaces an earlier one.
+        points = sorted({curve.hour * 60 + curve.minute: curve for curve in timecurve}.items())
+        channels = {channel: array("B", bytes(MINUTES_PER_DAY)) for channel in SCHEDULE_CHANNELS}
+
+        for index, (start, curve) in enumerate(points):
+            end, next_curve = points[(index + 1) % len(points)]
+            if end <= start:
+                end += MINUTES_PER_DAY
+            length = end - start
+
+            for channel, table in channels.items():
+                start_value = getattr(curve, channel)
+                delta = getattr(next_curve, channel) - start_value
+                for offset in range(length):
+                    table[(start + offset) % MINUTES_PER_DAY] = round(start_value + delta * offset / length)
+
+        return cls(channels)
+
+    @cached_property
+    def curves(self) -> dict[str, list[int]]:
+        """Return the light output of every minute of the day as lists, built once per table."""
+        return {channel: table.tolist() for channel, table in self.channels.items()}
+
+
+def _deviation(points: list[tuple[int, TimeCurve]], start: int, end: int) -> float:
+    """Return the largest deviation of the points between start and end, from the line between start and end."""
+    start_minute, start_curve = points[start]
+    end_minute, end_curve = points[end]
+    length = end_minute - start_minute
+
+    deviation = 0.0
+    for minute, curve in points[start + 1 : end]:
+        for channel in SCHEDULE_CHANNELS:
+            start_value = getattr(start_curve, channel)
+            # Integer cross product, so collinear points have a deviation of exactly 0.
+            error = (getattr(curve, channel) - start_value) * length - (getattr(end_curve, channel) - start_value) * (minute - start_minute)
+            deviation = max(deviation, abs(error) / length)
+
+    return deviation
+
+
+def simplify_timecurve(timecurve: list[TimeCurve], tolerance: float) -> tuple[list[TimeCurve], float]:
+    """Drop the points of a time curve that interpolating between the remaining points reproduces within the tolerance.
+
+    A tolerance of 0 only drops points that are exactly on the line between their neighbours, which doesn't change the schedule.
+    The first and last point are always kept. Returns the remaining points and the largest deviation of a dropped point.
+    """
+    # A later point at the same time replaces an earlier one.
+    points = sorted({curve.hour * 60 + curve.minute: curve for curve in timecurve}.items())
+    if len(points) <= 2:  # noqa: PLR2004
+        return [curve for _, curve in points], 0.0
+
+    kept = [points[0][1]]
+    max_deviation = 0.0
+    anchor = 0
+    # Deviation of the points between the anchor and the point before end.
+    segment_deviation = 0.0
+    end = anchor + 2
+    while end < len(points):
+        if (deviation := _deviation(points, anchor, end)) <= tolerance:
+            segment_deviation = deviation
+            end += 1
+            continue
+
+        # The point before end can't be dropped, continue from there.
+        kept.append(points[end - 1][1])
+        max_deviation = max(max_deviation, segment_deviation)
+        anchor = end - 1
+        segment_deviation = 0.0
+        end = anchor + 2
+
+    kept.append(points[-1][1])
+    max_deviation = max(max_deviation, segment_deviation)
+
+    return kept, max_deviation
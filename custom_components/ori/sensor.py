@@ -4,21 +4,25 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription, SensorStateClass, StateType
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import SIGNAL_STRENGTH_DECIBELS_MILLIWATT, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, SIGNAL_STRENGTH_DECIBELS_MILLIWATT, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import dt as dt_util
 
-from aquatlantis_ori import AquatlantisOriClient, Device, SensorType, SensorValidType
+from aquatlantis_ori import Device, SensorType, SensorValidType
 
-from .entity import OriEntity, OriEntityDescription
+from .commands import COMMAND_FIELDS
+from .coordinator import OriConfigEntry
+from .entity import OriEntity, OriEntityDescription, async_add_device_entities
+from .schedule import OriScheduleTable
 
 PARALLEL_UPDATES = 0
-SCAN_INTERVAL = timedelta(seconds=10)
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -28,23 +32,39 @@ class OriSensorEntityDescription(OriEntityDescription, SensorEntityDescription):
     value_fn: Callable[[Device], StateType | datetime]
 
 
+@dataclass(kw_only=True, frozen=True)
+class OriScheduleSensorEntityDescription(OriEntityDescription, SensorEntityDescription):
+    """Class describing Aquatlantis Ori light schedule sensor entities."""
+
+    channel: str
+
+
+@dataclass(kw_only=True, frozen=True)
+class OriLatencySensorEntityDescription(OriEntityDescription, SensorEntityDescription):
+    """Class describing Aquatlantis Ori command latency sensor entities."""
+
+    percentile: int
+
+
 DESCRIPTIONS: list[OriSensorEntityDescription] = [
     # Regular sensors
     OriSensorEntityDescription(
         key="water_temperature",
         translation_key="water_temperature",
+        device_fields=frozenset({"water_temperature", "sensor_valid"}),
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         value_fn=lambda device: device.water_temperature,
         available_fn=lambda device: device.sensor_valid == SensorValidType.VALID,
-        is_supported_fn=lambda device: device.sensor_type == SensorType.TEMPERATURE,
+        is_supported_fn=lambda snapshot: snapshot.sensor_type == SensorType.TEMPERATURE,
         entity_registry_enabled_default_fn=lambda device: device.sensor_valid == SensorValidType.VALID and device.water_temperature is not None,
     ),
     # Diagnostic sensors
     OriSensorEntityDescription(
         key="bluetooth_mac",
         translation_key="bluetooth_mac",
+        device_fields=frozenset({"bluetooth_mac"}),
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default_fn=lambda _: False,
         value_fn=lambda device: device.bluetooth_mac,
@@ -52,6 +72,7 @@ DESCRIPTIONS: list[OriSensorEntityDescription] = [
     OriSensorEntityDescription(
         key="ip",
         translation_key="ip",
+        device_fields=frozenset({"ip", "port"}),
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default_fn=lambda _: False,
         value_fn=lambda device: device.ip,
@@ -62,6 +83,7 @@ DESCRIPTIONS: list[OriSensorEntityDescription] = [
     OriSensorEntityDescription(
         key="mac",
         translation_key="mac",
+        device_fields=frozenset({"mac"}),
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default_fn=lambda _: False,
         value_fn=lambda device: device.mac,
@@ -69,6 +91,7 @@ DESCRIPTIONS: list[OriSensorEntityDescription] = [
     OriSensorEntityDescription(
         key="rssi",
         translation_key="rssi",
+        device_fields=frozenset({"rssi"}),
         entity_category=EntityCategory.DIAGNOSTIC,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
@@ -79,6 +102,7 @@ DESCRIPTIONS: list[OriSensorEntityDescription] = [
     OriSensorEntityDescription(
         key="ssid",
         translation_key="ssid",
+        device_fields=frozenset({"ssid"}),
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default_fn=lambda _: False,
         value_fn=lambda device: device.ssid,
@@ -86,6 +110,7 @@ DESCRIPTIONS: list[OriSensorEntityDescription] = [
     OriSensorEntityDescription(
         key="uptime",
         translation_key="uptime",
+        device_fields=frozenset({"online_time"}),
         entity_category=EntityCategory.DIAGNOSTIC,
         device_class=SensorDeviceClass.TIMESTAMP,
         entity_registry_enabled_default_fn=lambda _: False,
@@ -93,31 +118,69 @@ DESCRIPTIONS: list[OriSensorEntityDescription] = [
     ),
 ]
 
+SCHEDULE_DESCRIPTIONS: list[OriScheduleSensorEntityDescription] = [
+    OriScheduleSensorEntityDescription(
+        key="expected_intensity",
+        translation_key="expected_intensity",
+        device_fields=frozenset({"timecurve"}),
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        available_fn=lambda device: bool(device.timecurve),
+        channel="intensity",
+    ),
+]
+
+# A command round trip ends when the device reports the change, so the latency can only change together with these fields.
+LATENCY_DESCRIPTIONS: list[OriLatencySensorEntityDescription] = [
+    OriLatencySensorEntityDescription(
+        key="command_latency_p50",
+        translation_key="command_latency_p50",
+        device_fields=COMMAND_FIELDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        entity_registry_enabled_default_fn=lambda _: False,
+        percentile=50,
+    ),
+    OriLatencySensorEntityDescription(
+        key="command_latency_p95",
+        translation_key="command_latency_p95",
+        device_fields=COMMAND_FIELDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        entity_registry_enabled_default_fn=lambda _: False,
+        percentile=95,
+    ),
+    OriLatencySensorEntityDescription(
+        key="command_latency_p99",
+        translation_key="command_latency_p99",
+        device_fields=COMMAND_FIELDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        entity_registry_enabled_default_fn=lambda _: False,
+        percentile=99,
+    ),
+]
+
 
 async def async_setup_entry(
     _hass: HomeAssistant,
-    config_entry: ConfigEntry[AquatlantisOriClient],
+    config_entry: OriConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up a Aquatlantis Ori sensor entry."""
-    entities: list[SensorEntity] = []
-
-    client = config_entry.runtime_data
-
-    for device in client.get_devices():
-        entities.extend(
-            [
-                OriSensor(
-                    config_entry,
-                    description,
-                    device,
-                )
-                for description in DESCRIPTIONS
-                if description.is_supported_fn(device)
-            ]
-        )
-
-    async_add_entities(entities)
+    async_add_device_entities(
+        config_entry,
+        async_add_entities,
+        (OriSensor, DESCRIPTIONS),
+        (OriScheduleSensor, SCHEDULE_DESCRIPTIONS),
+        (OriLatencySensor, LATENCY_DESCRIPTIONS),
+    )
 
 
 class OriSensor(OriEntity[OriSensorEntityDescription], SensorEntity):
@@ -127,3 +190,69 @@ class OriSensor(OriEntity[OriSensorEntityDescription], SensorEntity):
     def native_value(self) -> StateType | datetime:
         """Return the value reported by the sensor."""
         return self.description.value_fn(self._device)
+
+
+class OriScheduleSensor(OriEntity[OriScheduleSensorEntityDescription], SensorEntity):
+    """Representation of a Aquatlantis Ori sensor following the light schedule."""
+
+    # The curve is only meant for charting the current schedule, recording 1440 values with every minute only fills the database.
+    _unrecorded_attributes = frozenset({"curve"})
+
+    def __init__(
+        self,
+        config_entry: OriConfigEntry,
+        description: OriScheduleSensorEntityDescription,
+        device: Device,
+    ) -> None:
+        """Initialize the schedule sensor."""
+        super().__init__(config_entry, description, device)
+        self._table = self._build_table()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the device and the time of day."""
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_time_change(self.hass, self._handle_minute, second=0))
+
+    @callback
+    def _handle_device_update(self) -> None:
+        """Build the schedule table from the pushed timecurve, then write the state."""
+        self._table = self._build_table()
+        super()._handle_device_update()
+
+    @callback
+    def _handle_minute(self, _now: datetime) -> None:
+        """Write the value of the new minute."""
+        self.async_write_ha_state()
+
+    def _build_table(self) -> OriScheduleTable | None:
+        """Build the schedule table of the device, None when it has no schedule."""
+        if not (timecurve := self._device.timecurve):
+            return None
+
+        return OriScheduleTable.from_timecurve(timecurve)
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the value the schedule has for the current minute."""
+        if self._table is None:
+            return None
+
+        now = dt_util.now()
+        return self._table.channels[self.description.channel][now.hour * 60 + now.minute]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the value of every minute of the day, for charting."""
+        return {
+            **super().extra_state_attributes,
+            "curve": self._table.curves[self.description.channel] if self._table is not None else None,
+        }
+
+
+class OriLatencySensor(OriEntity[OriLatencySensorEntityDescription], SensorEntity):
+    """Representation of a Aquatlantis Ori command latency sensor."""
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the latency percentile of the recent commands."""
+        return self._config_entry.runtime_data.command_latency[self._device.id].percentile(self.description.percentile)
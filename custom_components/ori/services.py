@@ -3,36 +3,73 @@
 from __future__ import annotations
 
 import logging
+import operator
 import re
+from collections.abc import Mapping
+from typing import Any
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_DEVICE_ID
-from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.exceptions import ServiceValidationError
+from homeassistant.components.light import ATTR_BRIGHTNESS, ATTR_EFFECT, ATTR_RGBW_COLOR
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 
-from aquatlantis_ori import AquatlantisOriClient, Device, TimeCurve
+from aquatlantis_ori import Device, TimeCurve
 
+from .commands import OriScheduleCommand
 from .const import DOMAIN
+from .coordinator import DATA_DEVICES, OriConfigEntry
+from .light import EFFECT_LIST, turn_on_command
+from .schedule import simplify_timecurve
 
 _LOGGER = logging.getLogger(__name__)
 
 ATTR_SCHEDULE = "schedule"
+ATTR_SIMPLIFY_TOLERANCE = "simplify_tolerance"
+
+# Time curve fields in the order of the comma separated format and of TimeCurve, with their maximum value.
+CURVE_FIELDS = {"hour": 23, "minute": 59, "intensity": 100, "red": 100, "green": 100, "blue": 100, "white": 100}
+CURVE_PATTERN = re.compile(r"(\d+),(\d+),(\d+),(\d+),(\d+),(\d+),(\d+)")
 
 SERVICE_SET_SCHEDULE = "set_schedule"
-SERVICE_SET_SCHEDULE_SCHEMA = vol.Schema(
+SERVICE_SET_SCHEDULE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [str]),
+            vol.Optional(ATTR_AREA_ID): vol.All(cv.ensure_list, [str]),
+            vol.Required(ATTR_SCHEDULE): vol.All(cv.ensure_list, [vol.Any(str, dict)]),
+            vol.Optional(ATTR_SIMPLIFY_TOLERANCE): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_DEVICE_ID, ATTR_AREA_ID),
+)
+
+SERVICE_GET_SCHEDULE = "get_schedule"
+SERVICE_GET_SCHEDULE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [str]),
+            vol.Optional(ATTR_AREA_ID): vol.All(cv.ensure_list, [str]),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_DEVICE_ID, ATTR_AREA_ID),
+)
+
+SERVICE_SET_LIGHT_BULK = "set_light_bulk"
+SERVICE_SET_LIGHT_BULK_SCHEMA = vol.Schema(
     {
-        vol.Required(ATTR_DEVICE_ID): str,
-        vol.Required(ATTR_SCHEDULE): TextSelector(TextSelectorConfig(multiple=True)),
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [str]),
+        vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional(ATTR_RGBW_COLOR): vol.All(vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 4)),
+        vol.Optional(ATTR_EFFECT): vol.In(EFFECT_LIST),
     }
 )
 
 
-def get_device_entry(hass: HomeAssistant, call: ServiceCall) -> dr.DeviceEntry:
-    """Get the device entry related to a service call."""
-    device_id = call.data[ATTR_DEVICE_ID]
+def get_device_entry(hass: HomeAssistant, device_id: str) -> dr.DeviceEntry:
+    """Get the device entry of a device id from a service call."""
     device_registry = dr.async_get(hass)
     if (device_entry := device_registry.async_get(device_id)) is None:
         raise ServiceValidationError(
@@ -43,104 +80,176 @@ def get_device_entry(hass: HomeAssistant, call: ServiceCall) -> dr.DeviceEntry:
     return device_entry
 
 
-def get_config(hass: HomeAssistant, device_entry: dr.DeviceEntry) -> ConfigEntry[AquatlantisOriClient]:
-    """Get the config entry related to a device entry."""
-    config_entry: ConfigEntry[AquatlantisOriClient] | None = None
-    for entry_id in device_entry.config_entries:
-        if (entry := hass.config_entries.async_get_entry(entry_id)) and entry.domain == DOMAIN:
-            config_entry = entry
+def get_area_device_ids(hass: HomeAssistant, area_ids: list[str]) -> list[str]:
+    """Get the ids of the integration devices in the given areas."""
+    device_registry = dr.async_get(hass)
 
-    if config_entry is None:
-        raise ServiceValidationError(
-            translation_domain=DOMAIN,
-            translation_key="config_entry_not_found",
-        )
+    return [
+        device_entry.id
+        for area_id in area_ids
+        for device_entry in dr.async_entries_for_area(device_registry, area_id)
+        if any(domain == DOMAIN for domain, _ in device_entry.identifiers)
+    ]
 
-    return config_entry
 
+def get_device(hass: HomeAssistant, device_entry: dr.DeviceEntry) -> tuple[OriConfigEntry, Device]:
+    """Get the config entry and device data of a device entry."""
+    devices = hass.data.get(DATA_DEVICES, {})
+    for domain, identifier in device_entry.identifiers:
+        if domain == DOMAIN and (target := devices.get(identifier)) is not None:
+            return target
 
-def get_device(device_entry: dr.DeviceEntry, config: ConfigEntry[AquatlantisOriClient]) -> Device:
-    """Get the device data for a config entry."""
-    device_data: Device | None = None
-    for device in config.runtime_data.get_devices():
-        if device_entry.identifiers == {(DOMAIN, str(device.id))}:
-            device_data = device
+    raise ServiceValidationError(
+        translation_domain=DOMAIN,
+        translation_key="device_not_found",
+    )
 
-    if device_data is None:
-        raise ServiceValidationError(
-            translation_domain=DOMAIN,
-            translation_key="device_not_found",
-        )
 
-    return device_data
+def get_targets(hass: HomeAssistant, call: ServiceCall) -> list[tuple[str, OriConfigEntry, Device]]:
+    """Get the devices targeted by a service call, by device or area.
+
+    All devices are looked up first, so an unknown device fails the call before any device is changed.
+    """
+    device_ids = dict.fromkeys([*call.data.get(ATTR_DEVICE_ID, []), *get_area_device_ids(hass, call.data.get(ATTR_AREA_ID, []))])
+
+    return [(device_id, *get_device(hass, get_device_entry(hass, device_id))) for device_id in device_ids]
+
 
+def parse_curve(curve: str | Mapping[str, Any]) -> TimeCurve | None:
+    """Parse and validate a single time curve in one pass, returns None when it's invalid.
 
-def validate_curve(curve: str) -> bool:
-    """Validate a single time curve string."""
-    last_hour = 23
-    last_minute = 59
-    min_percentage = 0
-    max_percentage = 100
+    A time curve is either a string like "12,30,80,50,50,50,50", or an object with the curve fields.
+    """
+    if isinstance(curve, str):
+        if (match := CURVE_PATTERN.fullmatch(curve.replace(" ", ""))) is None:
+            return None
+        # The pattern only matches digits, so the values can't be negative.
+        values = list(map(int, match.groups()))
+    elif isinstance(curve, Mapping) and curve.keys() == CURVE_FIELDS.keys():
+        values = [curve[field] for field in CURVE_FIELDS]
+        if any(type(value) is not int or value < 0 for value in values):
+            return None
+    else:
+        return None
 
-    if not re.fullmatch(r"\d+(,\d+){6}", curve):  # Match exactly 7 integer numbers separated by commas
-        return False
+    if not all(map(operator.le, values, CURVE_FIELDS.values())):
+        return None
 
-    parts = list(map(int, curve.split(",")))
-    if not 0 <= parts[0] <= last_hour:
-        return False
-    if not 0 <= parts[1] <= last_minute:
-        return False
-    return not any(not (min_percentage <= p <= max_percentage) for p in parts[2:])
+    return TimeCurve(*values)
 
 
-def parse_timecurves(timecurves: list[str]) -> list[TimeCurve]:
-    """Parse time curves from a list of strings."""
-    parsed_timecurves = []
+def parse_timecurves(timecurves: list[str | Mapping[str, Any]]) -> list[TimeCurve]:
+    """Parse time curves from a list of strings or objects, reporting all invalid curves at once."""
+    parsed_timecurves: list[TimeCurve] = []
+    invalid_curves: list[str] = []
     for curve in timecurves:
-        normalized_curve = curve.replace(" ", "")
-
-        if not validate_curve(normalized_curve):
-            raise ServiceValidationError(
-                translation_domain=DOMAIN,
-                translation_key="invalid_time_curve",
-                translation_placeholders={"curve": curve},
-            )
-
-        parts = normalized_curve.split(",")
-
-        parsed_timecurves.append(
-            TimeCurve(
-                hour=int(parts[0]),
-                minute=int(parts[1]),
-                intensity=int(parts[2]),
-                red=int(parts[3]),
-                green=int(parts[4]),
-                blue=int(parts[5]),
-                white=int(parts[6]),
-            )
+        if (timecurve := parse_curve(curve)) is None:
+            invalid_curves.append(str(curve))
+        else:
+            parsed_timecurves.append(timecurve)
+
+    if invalid_curves:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_time_curve",
+            translation_placeholders={"curve": "; ".join(invalid_curves)},
         )
 
     return parsed_timecurves
 
 
+def send_schedule(targets: list[tuple[str, OriConfigEntry, Device]], schedule: list[TimeCurve]) -> dict[str, Any]:
+    """Send a schedule to the targeted devices, reporting the updated, skipped and failed devices.
+
+    A device that can't take the command, for example because its command queue is full, doesn't stop the other devices.
+    """
+    updated: list[str] = []
+    skipped: list[str] = []
+    failed: list[dict[str, str]] = []
+    for device_id, config, device in targets:
+        if device.timecurve == schedule:
+            _LOGGER.debug("Device %s already has the schedule", device.devid)
+            skipped.append(device_id)
+            continue
+
+        _LOGGER.debug("Setting new schedule for device %s: %s", device.devid, schedule)
+        try:
+            config.runtime_data.async_send_command(device, OriScheduleCommand(timecurves=schedule))
+        except HomeAssistantError as exception:
+            _LOGGER.debug("Could not set the schedule of device %s: %s", device.devid, exception)
+            failed.append({"device_id": device_id, "error": str(exception)})
+        else:
+            updated.append(device_id)
+
+    return {"updated": updated, "skipped": skipped, "failed": failed}
+
+
 @callback
 def setup_services(hass: HomeAssistant) -> None:
     """Set up services."""
 
-    def set_schedule(call: ServiceCall) -> None:
+    @callback
+    def set_schedule(call: ServiceCall) -> ServiceResponse:
         """Set schedule."""
         schedule = parse_timecurves(call.data[ATTR_SCHEDULE])
-        device_entry = get_device_entry(hass, call)
-        config = get_config(hass, device_entry)
-        device = get_device(device_entry, config)
-
-        _LOGGER.debug("Setting new schedule: %s", schedule)
-
-        device.set_timecurve(schedule)
+        response: dict[str, Any] = {}
+        if (tolerance := call.data.get(ATTR_SIMPLIFY_TOLERANCE)) is not None:
+            simplified, max_deviation = simplify_timecurve(schedule, tolerance)
+            _LOGGER.debug("Simplified schedule from %d to %d points, with a max deviation of %.2f", len(schedule), len(simplified), max_deviation)
+            response["simplification"] = {"dropped": len(schedule) - len(simplified), "max_deviation": round(max_deviation, 2)}
+            schedule = simplified
+
+        return {**send_schedule(get_targets(hass, call), schedule), **response}
+
+    @callback
+    def get_schedule(call: ServiceCall) -> ServiceResponse:
+        """Get schedule, in the object format set_schedule accepts."""
+        return {
+            "devices": {
+                device_id: {
+                    "schedule": [{field: getattr(curve, field) for field in CURVE_FIELDS} for curve in device.timecurve or []],
+                }
+                for device_id, _, device in get_targets(hass, call)
+            }
+        }
+
+    @callback
+    def set_light_bulk(call: ServiceCall) -> ServiceResponse:
+        """Change the light of multiple devices."""
+        light_data = {key: value for key, value in call.data.items() if key != ATTR_DEVICE_ID}
+        results: dict[str, dict[str, str | bool]] = {}
+
+        # Sending only queues the command, the queue of each device sends it independently of the other devices.
+        for device_id in call.data[ATTR_DEVICE_ID]:
+            try:
+                config, device = get_device(hass, get_device_entry(hass, device_id))
+                config.runtime_data.async_send_command(device, turn_on_command(light_data))
+            except HomeAssistantError as exception:
+                _LOGGER.debug("Could not change the light of device %s: %s", device_id, exception)
+                results[device_id] = {"success": False, "error": str(exception)}
+            else:
+                results[device_id] = {"success": True}
+
+        return {"devices": results}
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_SCHEDULE,
         set_schedule,
         SERVICE_SET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SCHEDULE,
+        get_schedule,
+        SERVICE_GET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_LIGHT_BULK,
+        set_light_bulk,
+        SERVICE_SET_LIGHT_BULK_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
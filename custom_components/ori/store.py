@@ -0,0 +1,90 @@
+"""Aquatlantis Ori storage."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from aquatlantis_ori import Device, LightType, SensorType
+
+from .const import DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+
+
+@dataclass(kw_only=True, frozen=True)
+class OriDeviceSnapshot:
+    """Static fields of a device, these decide which entities are supported."""
+
+    light_type: LightType | None
+    sensor_type: SensorType | None
+    water_temperature_thresholds: tuple[float, float] | None
+
+    @classmethod
+    def from_device(cls, device: Device) -> OriDeviceSnapshot:
+        """Create a snapshot from the current device data."""
+        thresholds = device.water_temperature_thresholds
+        return cls(
+            light_type=device.light_type,
+            sensor_type=device.sensor_type,
+            water_temperature_thresholds=(thresholds.min_value, thresholds.max_value) if thresholds is not None else None,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> OriDeviceSnapshot:
+        """Create a snapshot from stored data."""
+        thresholds = data.get("water_temperature_thresholds")
+        return cls(
+            light_type=LightType(data["light_type"]) if data.get("light_type") is not None else None,
+            sensor_type=SensorType(data["sensor_type"]) if data.get("sensor_type") is not None else None,
+            water_temperature_thresholds=(thresholds[0], thresholds[1]) if thresholds is not None else None,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot as storable data."""
+        return {
+            "light_type": self.light_type.value if self.light_type is not None else None,
+            "sensor_type": self.sensor_type.value if self.sensor_type is not None else None,
+            "water_temperature_thresholds": list(self.water_temperature_thresholds) if self.water_temperature_thresholds is not None else None,
+        }
+
+
+class OriSnapshotStore:
+    """Persist the last known device snapshots of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, dict[str, Any]]]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._snapshots: dict[str, OriDeviceSnapshot] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored snapshots."""
+        if (data := await self._store.async_load()) is None:
+            return
+
+        self._snapshots = {device_id: OriDeviceSnapshot.from_dict(snapshot) for device_id, snapshot in data["devices"].items()}
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshots."""
+        await self._store.async_remove()
+
+    @callback
+    def async_get(self, device_id: str) -> OriDeviceSnapshot | None:
+        """Return the stored snapshot of a device."""
+        return self._snapshots.get(device_id)
+
+    @callback
+    def async_set(self, device_id: str, snapshot: OriDeviceSnapshot) -> bool:
+        """Store the snapshot of a device, returns True when it changed."""
+        if self._snapshots.get(device_id) == snapshot:
+            return False
+
+        self._snapshots[device_id] = snapshot
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        return True
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the data to store."""
+        return {"devices": {device_id: snapshot.as_dict() for device_id, snapshot in self._snapshots.items()}}
@@ -3,19 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import timedelta
 
 from homeassistant.components.update import UpdateDeviceClass, UpdateEntity, UpdateEntityDescription
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from aquatlantis_ori import AquatlantisOriClient
-
-from .entity import OriEntity, OriEntityDescription
+from .coordinator import OriConfigEntry
+from .entity import OriEntity, OriEntityDescription, async_add_device_entities
 
 PARALLEL_UPDATES = 0
-SCAN_INTERVAL = timedelta(seconds=10)
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -27,6 +23,7 @@ DESCRIPTIONS: list[OriUpdateEntityDescription] = [
     OriUpdateEntityDescription(
         key="firmware",
         translation_key="firmware",
+        device_fields=frozenset({"version", "latest_firmware_version", "firmware_name", "firmware_path"}),
         device_class=UpdateDeviceClass.FIRMWARE,
         state_attributes_fn=lambda device: {
             "filename": device.firmware_name,
@@ -38,28 +35,11 @@ DESCRIPTIONS: list[OriUpdateEntityDescription] = [
 
 async def async_setup_entry(
     _hass: HomeAssistant,
-    config_entry: ConfigEntry[AquatlantisOriClient],
+    config_entry: OriConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up a Aquatlantis Ori update entry."""
-    entities: list[UpdateEntity] = []
-
-    client = config_entry.runtime_data
-
-    for device in client.get_devices():
-        entities.extend(
-            [
-                OriUpdate(
-                    config_entry,
-                    description,
-                    device,
-                )
-                for description in DESCRIPTIONS
-                if description.is_supported_fn(device)
-            ]
-        )
-
-    async_add_entities(entities)
+    async_add_device_entities(config_entry, async_add_entities, (OriUpdate, DESCRIPTIONS))
 
 
 class OriUpdate(OriEntity[OriUpdateEntityDescription], UpdateEntity):
@@ -1,10 +1,13 @@
 """Integration tests."""
 
+from datetime import timedelta
+
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
 
-from custom_components.ori.const import DOMAIN
+from custom_components.ori.const import DEFAULT_COMMAND_WINDOW, DOMAIN, UPDATE_COOLDOWN
 
 
 def get_mock_config_data() -> dict[str, str]:
@@ -38,3 +41,17 @@ async def unload_integration(hass: HomeAssistant, config_entry: MockConfigEntry)
     """Unload the custom component for tests."""
     assert await hass.config_entries.async_unload(config_entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def flush_updates(hass: HomeAssistant) -> None:
+    """Write the pushed device updates that are waiting for the cooldown."""
+    # Pushed data is handed over to the event loop, it has to reach the debouncer before the cooldown can pass.
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=UPDATE_COOLDOWN))
+    await hass.async_block_till_done()
+
+
+async def flush_commands(hass: HomeAssistant) -> None:
+    """Send the light channel changes that are waiting for the command window."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(milliseconds=DEFAULT_COMMAND_WINDOW))
+    await hass.async_block_till_done()
@@ -0,0 +1,22 @@
+"""Fixtures for the benchmarks."""
+
+import json
+import platform
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from homeassistant.const import __version__ as HA_VERSION  # noqa: N812
+
+
+@pytest.fixture(name="fleet_results", scope="session")
+def fixture_fleet_results(pytestconfig: pytest.Config) -> Generator[list[dict[str, Any]]]:
+    """Collect the fleet benchmark results, and write them as JSON once all benchmarks ran."""
+    results: list[dict[str, Any]] = []
+    yield results
+
+    if results:
+        path = Path(pytestconfig.getoption("--fleet-json"))
+        data = {"python": platform.python_version(), "homeassistant": HA_VERSION, "results": sorted(results, key=lambda result: result["devices"])}
+        path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
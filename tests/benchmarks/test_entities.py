@@ -0,0 +1,87 @@
+"""Benchmark the entity properties that run on every state write."""
+
+import json
+import statistics
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from custom_components.ori.const import DOMAIN
+from tests import setup_integration, unload_integration
+from tests.test_helpers import create_test_device
+
+BASELINES = Path(__file__).parent / "baselines.json"
+
+# A property fails when it is this many times slower than its baseline, timing noise stays well below this.
+THRESHOLD = 2.0
+
+NUMBER = 2000
+REPEAT = 15
+
+# Properties read for every state write, besides the ones every entity has.
+COMMON_PROPERTIES = ("available", "state", "extra_state_attributes")
+PROPERTIES: dict[Platform, tuple[str, ...]] = {
+    Platform.BINARY_SENSOR: ("is_on",),
+    Platform.BUTTON: (),
+    Platform.LIGHT: ("is_on", "brightness", "rgbw_color", "color_mode", "supported_color_modes", "effect"),
+    Platform.NUMBER: ("native_value",),
+    Platform.SENSOR: ("native_value",),
+    Platform.UPDATE: ("installed_version", "latest_version"),
+}
+
+REFERENCE_DATA = list(range(50, 0, -1))
+
+
+def _measure(function: Callable[[], object]) -> float:
+    """Return the cost of a call relative to the reference workload.
+
+    The reference is timed right before every run, so a slow moment of the machine affects both, the median drops the outliers.
+    """
+    return statistics.median(
+        timeit.timeit(function, number=NUMBER) / timeit.timeit(lambda: sorted(REFERENCE_DATA), number=NUMBER) for _ in range(REPEAT)
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.usefixtures("enable_all_entities")
+@pytest.mark.parametrize("platform", list(PROPERTIES))
+async def test_entity_benchmark(hass: HomeAssistant, pytestconfig: pytest.Config, mock_aquatlantis_client: AsyncMock, platform: Platform) -> None:
+    """Test that the state properties of the entities are not slower than their baselines.
+
+    Times are stored relative to a fixed reference workload, so the baselines carry over between machines.
+    """
+    mock_aquatlantis_client.get_devices.return_value = [create_test_device()]
+    config_entry = await setup_integration(hass)
+
+    entities = [
+        entity
+        for entity_platform in async_get_platforms(hass, DOMAIN)
+        if entity_platform.domain == platform
+        for entity in entity_platform.entities.values()
+    ]
+    assert entities
+
+    measured: dict[str, float] = {}
+    for entity in entities:
+        for name in (*COMMON_PROPERTIES, *PROPERTIES[platform]):
+            cost = _measure(lambda entity=entity, name=name: getattr(entity, name))
+            measured[f"{platform}.{entity.entity_description.key}.{name}"] = round(cost, 3)
+
+    await unload_integration(hass, config_entry)
+
+    baselines: dict[str, float] = json.loads(BASELINES.read_text(encoding="utf-8")) if BASELINES.exists() else {}
+    if pytestconfig.getoption("--update-baselines"):
+        BASELINES.write_text(json.dumps(dict(sorted((baselines | measured).items())), indent=2) + "\n", encoding="utf-8")
+        return
+
+    missing = sorted(measured.keys() - baselines.keys())
+    assert not missing, "No baselines stored, run the benchmarks with --update-baselines to store them:\n" + "\n".join(missing)
+
+    regressions = [f"{key}: {cost} > {baselines[key]} x {THRESHOLD}" for key, cost in measured.items() if cost > baselines[key] * THRESHOLD]
+    assert not regressions, "Slower than the baselines:\n" + "\n".join(regressions)
@@ -0,0 +1,83 @@
+"""Benchmark setting up accounts with many devices."""
+
+import asyncio
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from tests import get_mock_config_entry, unload_integration
+from tests.fake_cloud import FakeOriCloud
+
+# Messages per second pushed by each device during the update stream.
+UPDATE_RATE = 1.0
+
+# Seconds the state writes of the update stream are counted.
+UPDATE_WINDOW = 2.0
+
+
+async def _setup(hass: HomeAssistant, config_entry: ConfigEntry) -> float:
+    """Set up the config entry, and return how long it took in seconds."""
+    started = time.perf_counter()
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return time.perf_counter() - started
+
+
+@pytest.mark.fleet
+@pytest.mark.parametrize("devices", [1, 10, 100, 500])
+async def test_fleet_benchmark(hass: HomeAssistant, entity_registry: er.EntityRegistry, fleet_results: list[dict[str, Any]], devices: int) -> None:
+    """Measure setup time, entities, peak memory and state writes for an account with the given number of devices.
+
+    Tracing memory allocations slows down the setup, so the peak memory is measured in a separate setup.
+    """
+    cloud = FakeOriCloud(devices, rate=UPDATE_RATE)
+
+    with cloud.patch():
+        config_entry = get_mock_config_entry()
+        config_entry.add_to_hass(hass)
+
+        setup_seconds = await _setup(hass, config_entry)
+
+        entities = len(er.async_entries_for_config_entry(entity_registry, config_entry.entry_id))
+        assert entities >= devices
+
+        writes = 0
+
+        @callback
+        def _count_write(_event: Event) -> None:
+            nonlocal writes
+            writes += 1
+
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+        pushes = cloud.pushes
+        started = time.perf_counter()
+        await asyncio.sleep(UPDATE_WINDOW)
+        elapsed = time.perf_counter() - started
+        unsub()
+
+        await unload_integration(hass, config_entry)
+
+        tracemalloc.start()
+        try:
+            await _setup(hass, config_entry)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {
+            "devices": devices,
+            "setup_seconds": round(setup_seconds, 4),
+            "entities": entities,
+            "peak_memory_bytes": peak_memory,
+            "pushes_per_second": round((cloud.pushes - pushes) / elapsed, 1),
+            "state_writes_per_second": round(writes / elapsed, 1),
+        }
+        fleet_results.append(result)
+
+        await unload_integration(hass, config_entry)
@@ -0,0 +1,62 @@
+"""Benchmark the time curve parser."""
+
+import re
+import timeit
+
+import pytest
+
+from aquatlantis_ori import TimeCurve
+from custom_components.ori.services import parse_timecurves
+
+# Schedules of this many points for this many devices, as generated by automations.
+POINTS = 500
+DEVICES = 20
+
+
+def _previous_parse_timecurves(timecurves: list[str]) -> list[TimeCurve]:
+    """Parse time curves like before, validating and converting each curve separately."""
+    parsed_timecurves = []
+    for curve in timecurves:
+        normalized_curve = curve.replace(" ", "")
+        if not re.fullmatch(r"\d+(,\d+){6}", normalized_curve):
+            raise ValueError(curve)
+        parts = list(map(int, normalized_curve.split(",")))
+        if not 0 <= parts[0] <= 23 or not 0 <= parts[1] <= 59 or any(not 0 <= p <= 100 for p in parts[2:]):
+            raise ValueError(curve)
+
+        parts_str = normalized_curve.split(",")
+        parsed_timecurves.append(
+            TimeCurve(
+                hour=int(parts_str[0]),
+                minute=int(parts_str[1]),
+                intensity=int(parts_str[2]),
+                red=int(parts_str[3]),
+                green=int(parts_str[4]),
+                blue=int(parts_str[5]),
+                white=int(parts_str[6]),
+            )
+        )
+
+    return parsed_timecurves
+
+
+def _schedules() -> list[list[str]]:
+    """Return large schedules for many devices."""
+    return [[f"{point % 24},{point % 60},{point % 101},{device},{point % 50}, 30, 40" for point in range(POINTS)] for device in range(DEVICES)]
+
+
+def test_parse_timecurves_same_result() -> None:
+    """Test the single pass parser returns the same time curves as the previous parser."""
+    for schedule in _schedules():
+        assert parse_timecurves(schedule) == _previous_parse_timecurves(schedule)
+
+
+@pytest.mark.benchmark
+def test_parse_timecurves_benchmark() -> None:
+    """Test the single pass parser is faster than the previous parser, for large schedules of many devices."""
+    schedules = _schedules()
+
+    previous = min(timeit.repeat(lambda: [_previous_parse_timecurves(schedule) for schedule in schedules], number=3, repeat=5))
+    current = min(timeit.repeat(lambda: [parse_timecurves(schedule) for schedule in schedules], number=3, repeat=5))
+
+    assert current < previous, f"Parsing {DEVICES} schedules of {POINTS} points: previous {previous * 1000:.1f} ms, current {current * 1000:.1f} ms"
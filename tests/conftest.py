@@ -7,6 +7,35 @@ import pytest
 
 from aquatlantis_ori import AquatlantisOriClient
 
+# Benchmark markers, with the option that runs them. Benchmarks are skipped by default.
+BENCHMARK_OPTIONS = {"benchmark": "--benchmark", "fleet": "--fleet"}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    parser.addoption("--benchmark", action="store_true", default=False, help="Run the timing benchmarks, that depend on the speed of the machine.")
+    parser.addoption("--fleet", action="store_true", default=False, help="Run the fleet benchmarks, with accounts of up to 500 devices.")
+    parser.addoption("--fleet-json", default="fleet-benchmark.json", help="File to write the fleet benchmark results to.")
+    parser.addoption("--update-baselines", action="store_true", default=False, help="Store the measured entity benchmarks as the new baselines.")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the benchmark markers."""
+    config.addinivalue_line("markers", "benchmark: timing benchmark, only runs with --benchmark")
+    config.addinivalue_line("markers", "fleet: fleet benchmark, only runs with --fleet")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip the benchmarks, unless they are asked for."""
+    for marker, option in BENCHMARK_OPTIONS.items():
+        if config.getoption(option):
+            continue
+
+        skip = pytest.mark.skip(reason=f"Only runs with {option}")
+        for item in items:
+            if item.get_closest_marker(marker) is not None:
+                item.add_marker(skip)
+
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations: Generator) -> Generator[None]:
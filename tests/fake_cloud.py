@@ -0,0 +1,234 @@
+"""Simulated Aquatlantis Ori cloud."""
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any
+from unittest.mock import patch
+
+from aquatlantis_ori import AquatlantisOriLoginError, Device, LightOptions, PowerType, TimeCurve
+from custom_components.ori.commands import LIGHT_CHANNELS
+from custom_components.ori.services import CURVE_FIELDS
+
+from .test_helpers import create_mqtt_payload, create_test_device
+
+
+def _device_data(number: int) -> dict[str, Any]:
+    """Return the data of a simulated device, unique per number."""
+    return {
+        "device_id": f"device{number}",
+        "name": f"Device {number}",
+        "devid": f"devid{number}",
+        "mac": f"00:11:22:{number >> 16 & 0xFF:02x}:{number >> 8 & 0xFF:02x}:{number & 0xFF:02x}",
+    }
+
+
+# Light channels that are named differently in the pushed payload.
+PAYLOAD_CHANNELS = {"intensity": "intensity", "red": "ch1brt", "green": "ch2brt", "blue": "ch3brt", "white": "ch4brt"}
+
+
+def _light_payload(power: PowerType, options: LightOptions) -> dict[str, Any]:
+    """Return the payload changes of a light change."""
+    payload: dict[str, Any] = {"power": power.value}
+    payload.update({PAYLOAD_CHANNELS[channel]: value for channel in LIGHT_CHANNELS if (value := getattr(options, channel)) is not None})
+    return payload
+
+
+def _timecurve_payload(timecurves: list[TimeCurve]) -> dict[str, Any]:
+    """Return the payload changes of a new schedule, its number of points followed by the flattened points."""
+    return {"timecurve": [len(timecurves), *(getattr(curve, field) for curve in timecurves for field in CURVE_FIELDS)]}
+
+
+# Payload changes pushed back for each command method of a device.
+COMMAND_METHODS: dict[str, Callable[..., dict[str, Any]]] = {
+    "set_light": _light_payload,
+    "set_power": lambda power: {"power": power.value},
+    "set_mode": lambda mode: {"mode": mode.value},
+    "set_dynamic_mode": lambda dynamic_mode: {"dynamic_mode": dynamic_mode.value},
+    "set_timecurve": _timecurve_payload,
+    **{f"set_{channel}": (lambda value, field=field: {field: value}) for channel, field in PAYLOAD_CHANNELS.items()},
+}
+
+
+@dataclass(frozen=True)
+class FakeOriNetwork:
+    """Delay of the messages between the simulated cloud and the integration."""
+
+    latency: float = 0.0
+    # Random extra delay of each message, up to this many seconds.
+    jitter: float = 0.0
+    seed: int = 0
+
+
+class FakeOriClient:
+    """Client of the simulated cloud, with the interface of AquatlantisOriClient the integration uses."""
+
+    def __init__(self, cloud: "FakeOriCloud", _email: str, password: str, _session: object = None) -> None:
+        """Initialize the client."""
+        self._cloud = cloud
+        self._password = password
+        self._connected = False
+
+    async def connect(self) -> None:
+        """Log in and connect to the pushed data."""
+        await asyncio.sleep(self._cloud.network.latency)
+        if self._password != self._cloud.password:
+            msg = "Invalid credentials"
+            raise AquatlantisOriLoginError(msg)
+
+        self._cloud.connect()
+        self._connected = True
+
+    def get_devices(self) -> list[Device]:
+        """Return the devices of the account."""
+        return list(self._cloud.devices)
+
+    async def close(self) -> None:
+        """Disconnect from the pushed data."""
+        if self._connected:
+            self._connected = False
+            # The last client waits for the delivery thread to stop, which blocks.
+            await asyncio.get_running_loop().run_in_executor(None, self._cloud.disconnect)
+
+
+class FakeOriCloud:
+    """Aquatlantis Ori cloud with simulated devices.
+
+    Pushed data is delivered from a separate thread, like the MQTT client of the real client does.
+    Each message is delayed by the network. Devices push a changed water temperature and signal strength
+    at the given rate per device, commands are answered by pushing the changed values.
+    """
+
+    def __init__(
+        self,
+        devices: int = 1,
+        *,
+        rate: float = 0.0,
+        network: FakeOriNetwork | None = None,
+        password: str = "pass",  # noqa: S107
+    ) -> None:
+        """Initialize the simulated cloud."""
+        self.password = password
+        self.network = network or FakeOriNetwork()
+        self.rate = rate
+        self.devices = [create_test_device(_device_data(number)) for number in range(devices)]
+        self.logins = 0
+        self.pushes = 0
+        self.commands: list[tuple[str, str]] = []
+        self._random = random.Random(self.network.seed)  # noqa: S311
+        self._payloads: dict[str, dict[str, Any]] = {device.id: {} for device in self.devices}
+        # Messages waiting for their delivery time, as (time, sequence, device, payload changes).
+        self._pending: list[tuple[float, int, Device, dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._connections = 0
+        self._paused = False
+        self._thread: threading.Thread | None = None
+
+    @contextmanager
+    def patch(self) -> Generator["FakeOriCloud"]:
+        """Point the integration at the simulated cloud, instead of the real one."""
+        with ExitStack() as stack:
+            stack.enter_context(patch("custom_components.ori.AquatlantisOriClient", self.client))
+            stack.enter_context(patch("custom_components.ori.config_flow.AquatlantisOriClient", self.client))
+            for name in COMMAND_METHODS:
+                stack.enter_context(patch.object(Device, name, self._command_method(name)))
+            stack.callback(self.stop)
+            yield self
+
+    def client(self, email: str, password: str, session: object = None) -> FakeOriClient:
+        """Create a client, like the AquatlantisOriClient constructor."""
+        return FakeOriClient(self, email, password, session)
+
+    def connect(self) -> None:
+        """Count a login, the pushed data is delivered while any client is connected."""
+        with self._condition:
+            self.logins += 1
+            self._connections += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="FakeOriCloud", daemon=True)
+                self._thread.start()
+
+    def disconnect(self) -> None:
+        """Disconnect a client, the last one stops the delivery of pushed data."""
+        with self._condition:
+            self._connections -= 1
+            last = not self._connections
+        if last:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop delivering pushed data and drop the messages that are waiting."""
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._pending.clear()
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def pause(self) -> None:
+        """Simulate a lost push connection, messages are kept until it is resumed."""
+        with self._condition:
+            self._paused = True
+
+    def resume(self) -> None:
+        """Simulate a reconnected push connection."""
+        with self._condition:
+            self._paused = False
+            self._condition.notify_all()
+
+    def wait_for_pushes(self, count: int, timeout: float = 5.0) -> bool:
+        """Wait until the given number of messages is pushed, in total. Blocks, call it from the executor."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.pushes >= count, timeout)
+
+    def _command_method(self, name: str) -> Callable[..., None]:
+        """Return a device command method that sends the command to the simulated cloud."""
+        payload_fn = COMMAND_METHODS[name]
+
+        def command(device: Device, *args: Any) -> None:  # noqa: ANN401
+            with self._condition:
+                self.commands.append((device.id, name))
+                self._schedule(device, payload_fn(*args))
+
+        return command
+
+    def _schedule(self, device: Device, changes: dict[str, Any]) -> None:
+        """Schedule pushing changed values of a device, after the network delay. Hold the condition."""
+        delay = self.network.latency + self._random.uniform(0, self.network.jitter)
+        heapq.heappush(self._pending, (time.monotonic() + delay, next(self._sequence), device, changes))
+        self._condition.notify_all()
+
+    def _run(self) -> None:
+        """Deliver the messages when they are due, and generate the periodic device updates."""
+        interval = 1 / (self.rate * len(self.devices)) if self.rate and self.devices else None
+        next_update = time.monotonic()
+        devices = itertools.cycle(self.devices)
+        updates = itertools.count()
+
+        with self._condition:
+            while self._thread is threading.current_thread():
+                now = time.monotonic()
+                if interval is not None and now >= next_update:
+                    update = next(updates)
+                    self._schedule(next(devices), {"water_temp": 240 + update % 30, "rssi": -60 - update % 10})
+                    next_update += interval
+
+                while not self._paused and self._pending and self._pending[0][0] <= now:
+                    _, _, device, changes = heapq.heappop(self._pending)
+                    payload = self._payloads[device.id]
+                    payload.update(changes)
+                    device.update_mqtt_data(create_mqtt_payload(payload))
+                    self.pushes += 1
+                    self._condition.notify_all()
+
+                deadlines = [] if interval is None else [next_update]
+                if self._pending and not self._paused:
+                    deadlines.append(self._pending[0][0])
+                self._condition.wait(max(min(deadlines) - now, 0) if deadlines else None)
@@ -0,0 +1,115 @@
+"""Test commands."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from aquatlantis_ori import DynamicModeType, LightOptions, ModeType, PowerType
+from custom_components.ori.commands import OriCommandQueue, OriCommandStats, OriLightCommand
+from custom_components.ori.const import COMMAND_QUEUE_SIZE
+
+from .test_helpers import create_test_device
+
+
+@dataclass(frozen=True)
+class _Command:
+    """Command changing the given device properties."""
+
+    changes: frozenset[str]
+
+    def messages(self, _device: object) -> list[Callable[[], None]]:
+        """Return no messages."""
+        return []
+
+    def properties(self) -> frozenset[str]:
+        """Return the device properties the command changes."""
+        return self.changes
+
+
+def test_light_command_properties() -> None:
+    """Test the properties changed by a light command."""
+    command = OriLightCommand(mode=ModeType.MANUAL, dynamic_mode=DynamicModeType.OFF, power=PowerType.ON, options=LightOptions(intensity=50))
+
+    assert command.properties() == {"mode", "dynamic_mode", "power", "intensity"}
+    assert OriLightCommand(power=PowerType.OFF).properties() == {"power"}
+
+
+async def test_queue_rate_limit(hass: HomeAssistant) -> None:
+    """Test that commands are sent in order, no faster than the command rate."""
+    device = create_test_device()
+    send = Mock()
+    queue = OriCommandQueue(hass, device, 1.0, OriCommandStats(), send)
+
+    first = _Command(frozenset({"power"}))
+    second = _Command(frozenset({"mode"}))
+    queue.async_put(first)
+    queue.async_put(second)
+
+    send.assert_called_once_with(device, first)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert send.call_count == 2
+    send.assert_called_with(device, second)
+
+    queue.async_shutdown()
+
+
+async def test_queue_superseded(hass: HomeAssistant) -> None:
+    """Test that queued commands are replaced by newer commands changing the same properties."""
+    device = create_test_device()
+    send = Mock()
+    stats = OriCommandStats()
+    queue = OriCommandQueue(hass, device, 1.0, stats, send)
+
+    queue.async_put(_Command(frozenset({"power"})))
+    queue.async_put(_Command(frozenset({"red"})))
+    queue.async_put(_Command(frozenset({"green"})))
+    latest = _Command(frozenset({"red", "blue"}))
+    queue.async_put(latest)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    assert [call.args[1] for call in send.call_args_list] == [
+        _Command(frozenset({"power"})),
+        _Command(frozenset({"green"})),
+        latest,
+    ]
+    assert stats.superseded == 1
+
+    queue.async_shutdown()
+
+
+async def test_queue_full(hass: HomeAssistant) -> None:
+    """Test that new commands are rejected when too many commands are waiting."""
+    device = create_test_device()
+    send = Mock()
+    queue = OriCommandQueue(hass, device, 1.0, OriCommandStats(), send)
+
+    # The first command is sent right away, the others wait for the command rate.
+    for index in range(COMMAND_QUEUE_SIZE + 1):
+        queue.async_put(_Command(frozenset({f"property{index}"})))
+
+    with pytest.raises(HomeAssistantError) as exc:
+        queue.async_put(_Command(frozenset({"another"})))
+    assert exc.value.translation_key == "command_queue_full"
+
+    # Commands that replace waiting ones are still accepted.
+    queue.async_put(_Command(frozenset({"property1"})))
+
+    # Commands without a limit are always accepted.
+    queue.async_put(_Command(frozenset({"another"})), limit=False)
+
+    queue.async_shutdown()
+    send.assert_called_once()
@@ -10,7 +10,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
 from aquatlantis_ori import AquatlantisOriConnectionError, AquatlantisOriError, AquatlantisOriLoginError, AquatlantisOriTimeoutError
-from custom_components.ori.const import DOMAIN
+from custom_components.ori.const import CONF_COMMAND_RATE, CONF_COMMAND_WINDOW, DOMAIN
 
 from . import get_mock_config_data, setup_integration
 
@@ -93,3 +93,17 @@ async def test_step_reconfigure(hass: HomeAssistant) -> None:
 
     assert config_entry.title == updated_data[CONF_EMAIL]
     assert config_entry.data == {**updated_data}
+
+
+async def test_options_flow(hass: HomeAssistant) -> None:
+    """Test the options flow."""
+    config_entry = await setup_integration(hass)
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result2 = await hass.config_entries.options.async_configure(result["flow_id"], user_input={CONF_COMMAND_WINDOW: 250, CONF_COMMAND_RATE: 2})
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+
+    assert config_entry.options == {CONF_COMMAND_WINDOW: 250, CONF_COMMAND_RATE: 2}
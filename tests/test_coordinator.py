@@ -0,0 +1,257 @@
+"""Test coordinator."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from homeassistant.components.light import ATTR_BRIGHTNESS, SERVICE_TURN_ON
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from aquatlantis_ori.http.models import LatestFirmwareResponseData
+from custom_components.ori.const import DOMAIN, READY_TIMEOUT, REFRESH_INTERVAL
+from custom_components.ori.coordinator import DATA_DEVICES, PUSH_METHODS
+
+from . import flush_updates, get_mock_config_data, setup_integration, unload_integration
+from .test_helpers import check_state_value, create_mqtt_payload, create_test_device
+
+
+async def test_pushed_data_updates_state(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that pushed device data is written to the state machine."""
+    device = create_test_device({"version": 10, "firmwareVersion": 10})
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    check_state_value(hass, "update.test_device_firmware", "off")
+
+    device.update_firmware_data(
+        LatestFirmwareResponseData(
+            id="firmware124",
+            brand="Aquatlantis",
+            pkey="testpkey",
+            subid=None,
+            firmwareVersion=11,
+            firmwareName="testpkey_V11.bin",
+            firmwarePath="https://example.com/testpkey_V11.bin",
+        )
+    )
+    await flush_updates(hass)
+
+    check_state_value(hass, "update.test_device_firmware", "on", {"filename": "testpkey_V11.bin"})
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_periodic_refresh(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that entities are refreshed periodically, even without pushed data."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    check_state_value(hass, "sensor.test_device_wifi_signal", "-70")
+
+    device.rssi = -50
+    await hass.async_block_till_done()
+
+    # Nothing was pushed, so the state is not written yet.
+    check_state_value(hass, "sensor.test_device_wifi_signal", "-70")
+
+    async_fire_time_changed(hass, dt_util.utcnow() + REFRESH_INTERVAL)
+    await hass.async_block_till_done()
+    await flush_updates(hass)
+
+    check_state_value(hass, "sensor.test_device_wifi_signal", "-50")
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_unload_restores_device(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that the device push methods are restored on unload."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    for name in PUSH_METHODS:
+        assert name in device.__dict__
+
+    await unload_integration(hass, config_entry)
+
+    for name in PUSH_METHODS:
+        assert name not in device.__dict__
+
+
+async def test_late_device_added_when_data_arrives(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that entities of a device without data are created once its first data is pushed."""
+    ready_device = create_test_device()
+    late_device = create_test_device({"device_id": "device456", "name": "Late Device", "light_type": None})
+    mock_aquatlantis_client.get_devices.return_value = [ready_device, late_device]
+
+    config_entry = await setup_integration(hass)
+
+    check_state_value(hass, "light.test_device_light", "on")
+    assert hass.states.get("light.late_device_light") is None
+
+    late_device.update_mqtt_data(create_mqtt_payload())
+    await hass.async_block_till_done()
+
+    check_state_value(hass, "light.late_device_light", "on")
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_ready_timeout(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock, caplog: LogCaptureFixture) -> None:
+    """Test that entities of a device without data are created after the ready timeout."""
+    device = create_test_device({"light_type": None})
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    assert hass.states.get("light.test_device_light") is None
+
+    with caplog.at_level("WARNING"):
+        async_fire_time_changed(hass, dt_util.utcnow() + READY_TIMEOUT)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("light.test_device_light") is not None
+    assert "No data received for device testdevid" in caplog.text
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_updates_are_coalesced(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that a burst of pushed updates results in a single state write per entity."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with patch("homeassistant.helpers.entity.Entity.async_write_ha_state") as write_state:
+        for rssi in (-60, -55, -50):
+            device.update_mqtt_data(create_mqtt_payload({"rssi": rssi}))
+        await hass.async_block_till_done()
+
+        write_state.assert_not_called()
+
+        await flush_updates(hass)
+
+    # Only the rssi changed, so only the wifi signal sensor is written.
+    write_state.assert_called_once()
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_unchanged_update_is_skipped(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that pushed data without changes doesn't write any state."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with patch("homeassistant.helpers.entity.Entity.async_write_ha_state") as write_state:
+        device.update_mqtt_data(create_mqtt_payload())
+        await flush_updates(hass)
+
+    write_state.assert_not_called()
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_field_change_updates_readers(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that a changed field updates all entities reading it."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    device.update_mqtt_data(create_mqtt_payload({"water_temp": 350}))
+    await flush_updates(hass)
+
+    check_state_value(hass, "sensor.test_device_water_temperature", "35.0")
+    check_state_value(hass, "binary_sensor.test_device_water_temperature", "on", {"water_temperature": 35.0})
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_field_changed_in_place_updates_readers(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that a field changed in place is still compared with its previous value."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+    update_callback = Mock()
+    remove_listener = config_entry.runtime_data.async_add_listener(device.id, frozenset({"timecurve"}), update_callback)
+
+    device.timecurve.pop()
+    device.update_mqtt_data(create_mqtt_payload({"timecurve": [1, 8, 0, 50, 10, 20, 30, 40]}))
+    await flush_updates(hass)
+
+    update_callback.assert_called_once()
+
+    remove_listener()
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_command_latency(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that a command is timed until the device reports the change."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+    latency = config_entry.runtime_data.command_latency[device.id]
+
+    with patch("aquatlantis_ori.device.Device.set_light"):
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: "light.test_device_light", ATTR_BRIGHTNESS: 255},
+            blocking=True,
+        )
+
+    assert latency.as_dict()["waiting"] == 1
+
+    # Data that doesn't reflect the command yet doesn't end the round trip.
+    device.update_mqtt_data(create_mqtt_payload({"rssi": -60}))
+    await flush_updates(hass)
+
+    assert latency.as_dict()["waiting"] == 1
+
+    device.update_mqtt_data(create_mqtt_payload({"intensity": 100}))
+    await flush_updates(hass)
+
+    assert latency.as_dict()["waiting"] == 0
+    assert latency.as_dict()["samples"] == 1
+    assert latency.percentile(50) is not None
+    check_state_value(hass, "sensor.test_device_command_latency_p50", str(latency.percentile(50)))
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_unload_keeps_device_of_other_entry(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that unloading a config entry keeps a device another config entry registered since."""
+    moved_device = create_test_device()
+    mock_aquatlantis_client.get_devices.side_effect = [[create_test_device()], [moved_device]]
+
+    config_entry = await setup_integration(hass)
+    other_entry = MockConfigEntry(domain=DOMAIN, entry_id="other_entry", data=get_mock_config_data())
+    other_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(other_entry.entry_id)
+    await hass.async_block_till_done()
+
+    await unload_integration(hass, config_entry)
+
+    assert hass.data[DATA_DEVICES][moved_device.id] == (other_entry, moved_device)
+
+    await unload_integration(hass, other_entry)
+
+    assert moved_device.id not in hass.data[DATA_DEVICES]
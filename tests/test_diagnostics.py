@@ -25,6 +25,8 @@ async def test_diagnostics(hass: HomeAssistant, hass_client: ClientSessionGenera
     assert result["config_entry"]["data"]["email"] == REDACTED
     assert result["config_entry"]["data"]["password"] == REDACTED
     assert result["devices"][0]["ssid"] == REDACTED
+    assert result["command_stats"] == {"commands": 0, "messages": 0, "coalesced": 0, "superseded": 0}
+    assert result["command_latency"] == {device.id: {"samples": 0, "waiting": 0, "unconfirmed": 0, "p50": None, "p95": None, "p99": None}}
 
     await unload_integration(hass, config_entry)
 
@@ -0,0 +1,107 @@
+"""Test the integration against the simulated cloud."""
+
+import pytest
+from homeassistant.components.light import ATTR_BRIGHTNESS, SERVICE_TURN_ON
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+
+from custom_components.ori import async_setup_entry
+
+from . import flush_updates, get_mock_config_data, get_mock_config_entry, setup_integration, unload_integration
+from .fake_cloud import FakeOriCloud, FakeOriNetwork
+
+
+async def _turn_on(hass: HomeAssistant, entity_id: str) -> None:
+    """Turn on a light at full brightness."""
+    await hass.services.async_call(LIGHT_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id, ATTR_BRIGHTNESS: 255}, blocking=True)
+
+
+async def test_fake_cloud_setup(hass: HomeAssistant) -> None:
+    """Test that all devices of the account get entities."""
+    cloud = FakeOriCloud(3)
+
+    with cloud.patch():
+        config_entry = await setup_integration(hass)
+
+        assert cloud.logins == 1
+        for number in range(3):
+            assert hass.states.get(f"light.device_{number}_light") is not None
+
+        await unload_integration(hass, config_entry)
+
+
+async def test_fake_cloud_invalid_auth(hass: HomeAssistant) -> None:
+    """Test that setup is retried when logging in fails."""
+    cloud = FakeOriCloud(password=get_mock_config_data()[CONF_PASSWORD] + "-changed")
+
+    with cloud.patch():
+        config_entry = get_mock_config_entry()
+        config_entry.add_to_hass(hass)
+
+        with pytest.raises(ConfigEntryNotReady):
+            await async_setup_entry(hass, config_entry)
+
+        assert cloud.logins == 0
+
+
+async def test_fake_cloud_pushed_data(hass: HomeAssistant) -> None:
+    """Test that data pushed from the client thread updates the entities of every device."""
+    cloud = FakeOriCloud(2, rate=50)
+
+    with cloud.patch():
+        config_entry = await setup_integration(hass)
+
+        assert await hass.async_add_executor_job(cloud.wait_for_pushes, 10)
+        await flush_updates(hass)
+
+        for number in range(2):
+            state = hass.states.get(f"sensor.device_{number}_water_temperature")
+            assert state is not None
+            assert 24.0 <= float(state.state) < 27.0
+            assert state.state != "25.0"
+
+        await unload_integration(hass, config_entry)
+
+
+async def test_fake_cloud_command_round_trip(hass: HomeAssistant) -> None:
+    """Test that a command is answered by the device after the simulated latency."""
+    cloud = FakeOriCloud(network=FakeOriNetwork(latency=0.05, jitter=0.02))
+
+    with cloud.patch():
+        config_entry = await setup_integration(hass)
+
+        await _turn_on(hass, "light.device_0_light")
+        assert cloud.commands == [("device0", "set_light")]
+
+        assert await hass.async_add_executor_job(cloud.wait_for_pushes, 1)
+        await flush_updates(hass)
+
+        assert cloud.devices[0].intensity == 100
+        latency = config_entry.runtime_data.command_latency["device0"]
+        assert latency.as_dict()["samples"] == 1
+        assert latency.percentile(50) >= 50.0
+
+        await unload_integration(hass, config_entry)
+
+
+async def test_fake_cloud_reconnect(hass: HomeAssistant) -> None:
+    """Test that changes made while the push connection is lost arrive once it is back."""
+    cloud = FakeOriCloud()
+
+    with cloud.patch():
+        config_entry = await setup_integration(hass)
+
+        cloud.pause()
+        await _turn_on(hass, "light.device_0_light")
+        assert not await hass.async_add_executor_job(cloud.wait_for_pushes, 1, 0.2)
+        assert cloud.devices[0].intensity == 80
+
+        cloud.resume()
+        assert await hass.async_add_executor_job(cloud.wait_for_pushes, 1)
+        await flush_updates(hass)
+
+        assert cloud.devices[0].intensity == 100
+
+        await unload_integration(hass, config_entry)
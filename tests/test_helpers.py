@@ -81,36 +81,45 @@ def create_test_device(data: dict[str, Any] | None = None) -> Device:
     )
 
     # Update device with MQTT data
-    device.update_mqtt_data(
-        MQTTRetrievePayloadParam(
-            timeoffset=data.get("timeoffset", "3600"),
-            rssi=data.get("rssi", -70),
-            device_time=data.get("device_time", 1719400000000),
-            version=data.get("version", "10"),
-            ssid=data.get("ssid", "TestWiFi"),
-            ip=data.get("ip", "192.168.1.100"),
-            intensity=data.get("intensity", 80),
-            custom1=data.get("custom1", [75, 90, 50, 64, 80]),
-            custom2=data.get("custom2", [50, 80, 100, 50, 90]),
-            custom3=data.get("custom3"),
-            custom4=data.get("custom4"),
-            timecurve=data.get("timecurve", [2, 8, 0, 50, 10, 20, 30, 40, 18, 30, 80, 60, 70, 80, 90]),
-            preview=data.get("preview", 0),
-            light_type=data.get("light_type", LightType.RGBW_ULTRA.value),
-            dynamic_mode=data.get("dynamic_mode", DynamicModeType.OFF.value),
-            mode=data.get("mode", ModeType.MANUAL.value),
-            power=data.get("power", PowerType.ON.value),
-            sensor_type=data.get("sensor_type", SensorType.TEMPERATURE.value),
-            water_temp=data.get("water_temp", 250),
-            sensor_valid=data.get("sensor_valid", SensorValidType.VALID.value),
-            water_temp_thrd=data.get("water_temp_thrd", [200, 300]),
-            air_temp_thrd=data.get("air_temp_thrd", [150, 250]),
-            air_humi_thrd=data.get("air_humi_thrd"),
-            ch1brt=data.get("ch1brt", 10),
-            ch2brt=data.get("ch2brt", 20),
-            ch3brt=data.get("ch3brt", 30),
-            ch4brt=data.get("ch4brt", 40),
-        )
-    )
+    device.update_mqtt_data(create_mqtt_payload(data))
 
     return device
+
+
+def create_mqtt_payload(data: dict[str, Any] | None = None) -> MQTTRetrievePayloadParam:
+    """Create a pushed MQTT payload with sensible defaults.
+
+    Note that raw keys and values need to be provided, as the Device will parse them.
+    """
+    if data is None:
+        data = {}
+
+    return MQTTRetrievePayloadParam(
+        timeoffset=data.get("timeoffset", "3600"),
+        rssi=data.get("rssi", -70),
+        device_time=data.get("device_time", 1719400000000),
+        version=data.get("version", "10"),
+        ssid=data.get("ssid", "TestWiFi"),
+        ip=data.get("ip", "192.168.1.100"),
+        intensity=data.get("intensity", 80),
+        custom1=data.get("custom1", [75, 90, 50, 64, 80]),
+        custom2=data.get("custom2", [50, 80, 100, 50, 90]),
+        custom3=data.get("custom3"),
+        custom4=data.get("custom4"),
+        timecurve=data.get("timecurve", [2, 8, 0, 50, 10, 20, 30, 40, 18, 30, 80, 60, 70, 80, 90]),
+        preview=data.get("preview", 0),
+        light_type=data.get("light_type", LightType.RGBW_ULTRA.value),
+        dynamic_mode=data.get("dynamic_mode", DynamicModeType.OFF.value),
+        mode=data.get("mode", ModeType.MANUAL.value),
+        power=data.get("power", PowerType.ON.value),
+        sensor_type=data.get("sensor_type", SensorType.TEMPERATURE.value),
+        water_temp=data.get("water_temp", 250),
+        sensor_valid=data.get("sensor_valid", SensorValidType.VALID.value),
+        water_temp_thrd=data.get("water_temp_thrd", [200, 300]),
+        air_temp_thrd=data.get("air_temp_thrd", [150, 250]),
+        air_humi_thrd=data.get("air_humi_thrd"),
+        ch1brt=data.get("ch1brt", 10),
+        ch2brt=data.get("ch2brt", 20),
+        ch3brt=data.get("ch3brt", 30),
+        ch4brt=data.get("ch4brt", 40),
+    )
@@ -9,6 +9,7 @@ from homeassistant.exceptions import ConfigEntryNotReady
 
 from aquatlantis_ori import AquatlantisOriClient, AquatlantisOriError
 from custom_components.ori import async_setup_entry
+from custom_components.ori.coordinator import OriCoordinator
 
 from . import get_mock_config_entry, setup_integration, unload_integration
 
@@ -17,8 +18,9 @@ async def test_setup_and_unload_entry(hass: HomeAssistant) -> None:
     """Test entry setup and unload."""
     config_entry = await setup_integration(hass)
 
-    # Check that the client is stored as runtime_data
-    assert isinstance(config_entry.runtime_data, AquatlantisOriClient)
+    # Check that the coordinator and client are stored as runtime_data
+    assert isinstance(config_entry.runtime_data, OriCoordinator)
+    assert isinstance(config_entry.runtime_data.client, AquatlantisOriClient)
 
     # Unload the entry
     await unload_integration(hass, config_entry)
@@ -47,4 +49,4 @@ async def test_setup_entry_timeout_exception(hass: HomeAssistant, mock_aquatlant
         config_entry = await setup_integration(hass)
         await unload_integration(hass, config_entry)
 
-    assert "Data wasn't available during setup, it should be available soon" in caplog.text
+    assert "Connecting timed out, the entities of each device are created once its data is received" in caplog.text
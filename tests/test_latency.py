@@ -0,0 +1,46 @@
+"""Test command latency."""
+
+from custom_components.ori.const import LATENCY_TIMEOUT
+from custom_components.ori.latency import OriCommandLatency
+
+from .test_helpers import create_test_device
+
+
+def test_latency_percentiles() -> None:
+    """Test the latency percentiles of the recent round trips."""
+    device = create_test_device()
+    latency = OriCommandLatency()
+
+    assert latency.percentile(50) is None
+
+    for index in range(100):
+        latency.sent({"rssi": device.rssi}, 0)
+        latency.pushed(device, (index + 1) / 1000)
+
+    assert latency.percentile(50) == 50.0
+    assert latency.percentile(95) == 95.0
+    assert latency.percentile(99) == 99.0
+
+
+def test_latency_unconfirmed() -> None:
+    """Test that commands the device doesn't report back are counted as unconfirmed."""
+    device = create_test_device()
+    latency = OriCommandLatency()
+
+    latency.sent({"rssi": 0}, 0)
+    latency.pushed(device, 1)
+    assert latency.as_dict()["waiting"] == 1
+
+    latency.pushed(device, LATENCY_TIMEOUT.total_seconds() + 1)
+    assert latency.as_dict() == {"samples": 0, "waiting": 0, "unconfirmed": 1, "p50": None, "p95": None, "p99": None}
+
+
+def test_latency_unconfirmed_without_push() -> None:
+    """Test that commands that timed out are dropped when sending, when the device doesn't push data."""
+    latency = OriCommandLatency()
+
+    for index in range(100):
+        latency.sent({"rssi": 0}, index * LATENCY_TIMEOUT.total_seconds())
+
+    assert latency.as_dict()["waiting"] == 2
+    assert latency.as_dict()["unconfirmed"] == 98
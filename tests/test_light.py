@@ -3,16 +3,21 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from _pytest.logging import LogCaptureFixture
 from homeassistant.components.light import ATTR_BRIGHTNESS, ATTR_EFFECT, ATTR_RGBW_COLOR, SERVICE_TURN_OFF, SERVICE_TURN_ON, ColorMode
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
-from aquatlantis_ori import DynamicModeType, LightOptions, ModeType, PowerType, TimeCurve
+from aquatlantis_ori import DynamicModeType, LightOptions, ModeType, PowerType
+from custom_components.ori.commands import OriCommandStats
+from custom_components.ori.const import OPTIMISTIC_TIMEOUT
 from custom_components.ori.light import EFFECT_AUTOMATIC, EFFECT_DYNAMIC, EFFECT_MANUAL, _convert_100_to_255, _convert_255_to_100
 
-from . import setup_integration, unload_integration
-from .test_helpers import check_state_value, create_test_device
+from . import flush_updates, setup_integration, unload_integration
+from .test_helpers import check_state_value, create_mqtt_payload, create_test_device
 
 
 async def test_light(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
@@ -137,18 +142,24 @@ async def test_light_turn_on_with_brightness(hass: HomeAssistant, mock_aquatlant
 
 
 @pytest.mark.parametrize(
-    ("effect", "mode", "dynamic"),
+    ("effect", "current", "expected"),
     [
-        (EFFECT_MANUAL, ModeType.MANUAL, DynamicModeType.OFF),
-        (EFFECT_AUTOMATIC, ModeType.AUTOMATIC, DynamicModeType.OFF),
-        (EFFECT_DYNAMIC, ModeType.MANUAL, DynamicModeType.ON),
+        (EFFECT_MANUAL, (ModeType.AUTOMATIC, DynamicModeType.ON), (ModeType.MANUAL, DynamicModeType.OFF)),
+        (EFFECT_AUTOMATIC, (ModeType.MANUAL, DynamicModeType.ON), (ModeType.AUTOMATIC, DynamicModeType.OFF)),
+        (EFFECT_DYNAMIC, (ModeType.AUTOMATIC, DynamicModeType.OFF), (ModeType.MANUAL, DynamicModeType.ON)),
     ],
 )
 async def test_light_turn_on_with_effect(
-    hass: HomeAssistant, mock_aquatlantis_client: AsyncMock, effect: str, mode: ModeType, dynamic: DynamicModeType
+    hass: HomeAssistant,
+    mock_aquatlantis_client: AsyncMock,
+    effect: str,
+    current: tuple[ModeType, DynamicModeType],
+    expected: tuple[ModeType, DynamicModeType],
 ) -> None:
-    """Test light turn on with effect."""
-    device = create_test_device()
+    """Test light turn on with effect, from the current mode and dynamic mode to the expected ones."""
+    current_mode, current_dynamic = current
+    mode, dynamic = expected
+    device = create_test_device({"mode": current_mode.value, "dynamic_mode": current_dynamic.value})
     mock_aquatlantis_client.get_devices.return_value = [device]
 
     config_entry = await setup_integration(hass)
@@ -175,13 +186,47 @@ async def test_light_turn_on_with_effect(
     if mode == ModeType.MANUAL:
         # If the mode is manual, we should call set_light with PowerType.ON and LightOptions
         call_light.assert_called_once_with(PowerType.ON, LightOptions())
+    else:
+        call_light.assert_not_called()
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_light_turn_on_with_current_effect(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test light turn on with the effect the device already has only sends the light change."""
+    device = create_test_device({"mode": ModeType.MANUAL.value, "dynamic_mode": DynamicModeType.OFF.value})
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with (
+        patch("aquatlantis_ori.device.Device.set_light") as call_light,
+        patch("aquatlantis_ori.device.Device.set_mode") as call_mode,
+        patch("aquatlantis_ori.device.Device.set_dynamic_mode") as call_dynamic,
+    ):
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_ON,
+            {
+                ATTR_ENTITY_ID: "light.test_device_light",
+                ATTR_EFFECT: EFFECT_MANUAL,
+                ATTR_BRIGHTNESS: 255,
+            },
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+    call_mode.assert_not_called()
+    call_dynamic.assert_not_called()
+    call_light.assert_called_once_with(PowerType.ON, LightOptions(intensity=100))
+    assert config_entry.runtime_data.command_stats == OriCommandStats(commands=1, messages=1, coalesced=0)
 
     await unload_integration(hass, config_entry)
 
 
 async def test_light_turn_off(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
     """Test light turn off."""
-    device = create_test_device()
+    device = create_test_device({"mode": ModeType.AUTOMATIC.value})
     mock_aquatlantis_client.get_devices.return_value = [device]
 
     config_entry = await setup_integration(hass)
@@ -205,6 +250,109 @@ async def test_light_turn_off(hass: HomeAssistant, mock_aquatlantis_client: Asyn
     await unload_integration(hass, config_entry)
 
 
+async def test_light_turn_off_manual(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test light turn off in manual mode only changes the power."""
+    device = create_test_device({"mode": ModeType.MANUAL.value})
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with (
+        patch("aquatlantis_ori.device.Device.set_power") as call_power,
+        patch("aquatlantis_ori.device.Device.set_mode") as call_mode,
+    ):
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_OFF,
+            {ATTR_ENTITY_ID: "light.test_device_light"},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+    call_power.assert_called_once_with(PowerType.OFF)
+    call_mode.assert_not_called()
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_light_optimistic_state_confirmed(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock, caplog: LogCaptureFixture) -> None:
+    """Test that the requested light state is shown right away and kept once the device confirms it."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with patch("aquatlantis_ori.device.Device.set_light"):
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: "light.test_device_light", ATTR_BRIGHTNESS: 255},
+            blocking=True,
+        )
+
+    check_state_value(hass, "light.test_device_light", "on", {"brightness": 255})
+
+    device.update_mqtt_data(create_mqtt_payload({"intensity": 100}))
+    await flush_updates(hass)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + OPTIMISTIC_TIMEOUT)
+    await hass.async_block_till_done()
+
+    check_state_value(hass, "light.test_device_light", "on", {"brightness": 255})
+    assert "rolling back" not in caplog.text
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_light_optimistic_state_rolled_back(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock, caplog: LogCaptureFixture) -> None:
+    """Test that the requested light state is rolled back when the device does not confirm it."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with patch("aquatlantis_ori.device.Device.set_power"):
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_OFF,
+            {ATTR_ENTITY_ID: "light.test_device_light"},
+            blocking=True,
+        )
+
+    check_state_value(hass, "light.test_device_light", "off")
+
+    async_fire_time_changed(hass, dt_util.utcnow() + OPTIMISTIC_TIMEOUT)
+    await hass.async_block_till_done()
+
+    check_state_value(hass, "light.test_device_light", "on")
+    assert "Device testdevid did not confirm is_light_on for light.test_device_light, rolling back to the reported state" in caplog.text
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_light_optimistic_light_mode(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that the light mode attribute follows the requested effect right away."""
+    device = create_test_device({"mode": ModeType.AUTOMATIC.value})
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with (
+        patch("aquatlantis_ori.device.Device.set_mode"),
+        patch("aquatlantis_ori.device.Device.set_light"),
+    ):
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: "light.test_device_light", ATTR_EFFECT: EFFECT_MANUAL},
+            blocking=True,
+        )
+
+    check_state_value(hass, "light.test_device_light", "on", {"effect": EFFECT_MANUAL, "light_mode": EFFECT_MANUAL})
+
+    await unload_integration(hass, config_entry)
+
+
 @pytest.mark.parametrize(
     ("mode", "dynamic", "effect"),
     [
@@ -271,42 +419,3 @@ def test_convert_255_to_100(input_value: int, expected_output: int) -> None:
 def test_convert_100_to_255(input_value: int, expected_output: int) -> None:
     """Test conversion from 0-100 range to 0-255 range."""
     assert _convert_100_to_255(input_value) == expected_output
-
-
-async def test_light_schedule_attribute(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
-    """Test light with schedule attribute set."""
-    device = create_test_device({"mode": ModeType.AUTOMATIC.value})
-    device.timecurve = [
-        TimeCurve(hour=0, minute=0, intensity=0, red=0, green=0, blue=0, white=0),
-        TimeCurve(hour=23, minute=59, intensity=100, red=255, green=255, blue=255, white=255),
-    ]
-    mock_aquatlantis_client.get_devices.return_value = [device]
-
-    config_entry = await setup_integration(hass)
-
-    check_state_value(
-        hass,
-        "light.test_device_light",
-        "on",
-        {
-            "schedule": {
-                "00:00": {"intensity": 0, "red": 0, "green": 0, "blue": 0, "white": 0},
-                "23:59": {"intensity": 100, "red": 255, "green": 255, "blue": 255, "white": 255},
-            }
-        },
-    )
-
-    await unload_integration(hass, config_entry)
-
-
-async def test_light_no_schedule_attribute(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
-    """Test light with no schedule attribute set."""
-    device = create_test_device({"mode": ModeType.AUTOMATIC.value})
-    device.timecurve = None
-    mock_aquatlantis_client.get_devices.return_value = [device]
-
-    config_entry = await setup_integration(hass)
-
-    check_state_value(hass, "light.test_device_light", "on", {"schedule": None})
-
-    await unload_integration(hass, config_entry)
@@ -1,14 +1,24 @@
 """Test number."""
 
-from unittest.mock import AsyncMock, patch
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from _pytest.logging import LogCaptureFixture
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.components.light import SERVICE_TURN_OFF
 from homeassistant.components.number import ATTR_VALUE, SERVICE_SET_VALUE
 from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
-from . import setup_integration, unload_integration
+from aquatlantis_ori import LightOptions, PowerType
+from custom_components.ori.commands import OriCommandStats
+from custom_components.ori.const import OPTIMISTIC_TIMEOUT
+
+from . import flush_commands, setup_integration, unload_integration
 from .test_helpers import check_state_value, create_test_device
 
 
@@ -62,7 +72,150 @@ async def test_number_set(hass: HomeAssistant, mock_aquatlantis_client: AsyncMoc
         )
         await hass.async_block_till_done()
 
+        # The change waits for the command window, so other channel changes can be combined.
+        call.assert_not_called()
+
+        await flush_commands(hass)
+
     # Test that the number change was sent to the device
     call.assert_called_once_with(50)
 
     await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_number_set_coalesced(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that channel changes within the command window are sent as a single light change."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with patch("aquatlantis_ori.device.Device.set_light") as call:
+        for channel, value in (("red", 10), ("green", 20), ("blue", 30), ("white", 40)):
+            await hass.services.async_call(
+                NUMBER_DOMAIN,
+                SERVICE_SET_VALUE,
+                {ATTR_ENTITY_ID: f"number.test_device_{channel}", ATTR_VALUE: value},
+                blocking=True,
+            )
+        await flush_commands(hass)
+
+    call.assert_called_once_with(PowerType.ON, LightOptions(red=10, green=20, blue=30, white=40))
+    assert config_entry.runtime_data.command_stats == OriCommandStats(commands=1, messages=1, coalesced=3)
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_number_set_before_other_command(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that collected channel changes are sent before a later command, instead of after the command window."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    calls = Mock()
+    with patch("aquatlantis_ori.device.Device.set_red", calls.set_red), patch("aquatlantis_ori.device.Device.set_power", calls.set_power):
+        await hass.services.async_call(
+            NUMBER_DOMAIN,
+            SERVICE_SET_VALUE,
+            {ATTR_ENTITY_ID: "number.test_device_red", ATTR_VALUE: 50},
+            blocking=True,
+        )
+        await hass.services.async_call(LIGHT_DOMAIN, SERVICE_TURN_OFF, {ATTR_ENTITY_ID: "light.test_device_light"}, blocking=True)
+
+        # The channel change is sent right away, the light change once the command rate allows it.
+        assert [call[0] for call in calls.mock_calls] == ["set_red"]
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert [call[0] for call in calls.mock_calls] == ["set_red", "set_power"]
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_number_set_queue_full(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that collected channel changes are sent from the command window timer, even when the queue is full."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with (
+        patch("custom_components.ori.commands.COMMAND_QUEUE_SIZE", 0),
+        patch("aquatlantis_ori.device.Device.set_red") as call,
+    ):
+        await hass.services.async_call(
+            NUMBER_DOMAIN,
+            SERVICE_SET_VALUE,
+            {ATTR_ENTITY_ID: "number.test_device_red", ATTR_VALUE: 50},
+            blocking=True,
+        )
+        await flush_commands(hass)
+
+    call.assert_called_once_with(50)
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_number_optimistic_state(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that the requested value is shown right away and rolled back when the device does not confirm it."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with patch("aquatlantis_ori.device.Device.set_red"):
+        await hass.services.async_call(
+            NUMBER_DOMAIN,
+            SERVICE_SET_VALUE,
+            {ATTR_ENTITY_ID: "number.test_device_red", ATTR_VALUE: 50},
+            blocking=True,
+        )
+
+        # Shown before the command window passed.
+        check_state_value(hass, "number.test_device_red", "50")
+
+        await flush_commands(hass)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + OPTIMISTIC_TIMEOUT)
+    await hass.async_block_till_done()
+
+    check_state_value(hass, "number.test_device_red", "10")
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_number_optimistic_state_set_back(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock, caplog: LogCaptureFixture) -> None:
+    """Test that setting the reported value again replaces the requested value that is still shown."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with patch("aquatlantis_ori.device.Device.set_red"):
+        for value in (50, 10):
+            await hass.services.async_call(
+                NUMBER_DOMAIN,
+                SERVICE_SET_VALUE,
+                {ATTR_ENTITY_ID: "number.test_device_red", ATTR_VALUE: value},
+                blocking=True,
+            )
+
+        # The reported value is shown right away, not the earlier requested one.
+        check_state_value(hass, "number.test_device_red", "10")
+
+        await flush_commands(hass)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + OPTIMISTIC_TIMEOUT)
+    await hass.async_block_till_done()
+
+    check_state_value(hass, "number.test_device_red", "10")
+    assert "rolling back" not in caplog.text
+
+    await unload_integration(hass, config_entry)
@@ -0,0 +1,78 @@
+"""Test recorder write volume."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, State, callback
+
+from . import flush_updates, setup_integration, unload_integration
+from .test_helpers import create_mqtt_payload, create_test_device
+
+PUSHES_PER_DAY = 288
+PRESET_CHANGES_PER_DAY = 4
+
+
+def _without_state_info(event: Event[EventStateChangedData]) -> Event[EventStateChangedData]:
+    """Return the event as it would look if the entity declared no unrecorded attributes."""
+    state = event.data["new_state"]
+    assert state is not None
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": event.data["entity_id"],
+            "old_state": event.data["old_state"],
+            "new_state": State(state.entity_id, state.state, state.attributes),
+        },
+    )
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_recorder_write_volume(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test that the unrecorded attributes reduce what a simulated day of pushes writes to the recorder."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    events: list[Event[EventStateChangedData]] = []
+
+    @callback
+    def _collect(event: Event[EventStateChangedData]) -> None:
+        if event.data["new_state"] is not None:
+            events.append(event)
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _collect)
+
+    # A water temperature change every five minutes and an occasional preset change.
+    for push in range(PUSHES_PER_DAY):
+        data = {"water_temp": 240 + push % 30}
+        if push % (PUSHES_PER_DAY // PRESET_CHANGES_PER_DAY) == 0:
+            data["custom1"] = [push % 100, 90, 50, 64, 80]
+        device.update_mqtt_data(create_mqtt_payload(data))
+        await flush_updates(hass)
+
+    unsub()
+
+    # The recorder stores each distinct attribute row once.
+    before = {StateAttributes.shared_attrs_bytes_from_event(_without_state_info(event), None) for event in events}
+    after = {StateAttributes.shared_attrs_bytes_from_event(event, None) for event in events}
+    bytes_before = sum(len(row) for row in before)
+    bytes_after = sum(len(row) for row in after)
+    volume = f"{len(events)} state rows per day, {len(before)} -> {len(after)} attribute rows, {bytes_before} -> {bytes_after} attribute bytes"
+
+    assert len(after) < len(before), volume
+    assert bytes_after < bytes_before, volume
+
+    binary_sensor = hass.states.get("binary_sensor.test_device_water_temperature")
+    assert binary_sensor is not None
+    assert binary_sensor.state_info is not None
+    assert {"min_value", "max_value", "app_notifications"} <= binary_sensor.state_info["unrecorded_attributes"]
+
+    button = hass.states.get("button.test_device_preset_1")
+    assert button is not None
+    assert button.state_info is not None
+    assert {"intensity", "red", "green", "blue", "white"} <= button.state_info["unrecorded_attributes"]
+
+    await unload_integration(hass, config_entry)
@@ -0,0 +1,59 @@
+"""Test schedule."""
+
+from aquatlantis_ori import TimeCurve
+from custom_components.ori.schedule import MINUTES_PER_DAY, OriScheduleTable, simplify_timecurve
+
+
+def test_schedule_table_interpolation() -> None:
+    """Test the schedule table is interpolated linearly, wrapping around midnight."""
+    table = OriScheduleTable.from_timecurve(
+        [
+            TimeCurve(hour=18, minute=0, intensity=0, red=0, green=0, blue=0, white=0),
+            TimeCurve(hour=6, minute=0, intensity=100, red=50, green=50, blue=50, white=100),
+        ]
+    )
+
+    morning = {channel: values[6 * 60] for channel, values in table.channels.items()}
+    assert morning == {"intensity": 100, "red": 50, "green": 50, "blue": 50, "white": 100}
+    assert table.channels["intensity"][12 * 60] == 50
+    assert table.channels["intensity"][18 * 60] == 0
+    # Midnight is halfway between 18:00 and 06:00.
+    assert table.channels["intensity"][0] == 50
+    assert len(table.channels["intensity"]) == MINUTES_PER_DAY
+    assert table.curves["intensity"] == table.channels["intensity"].tolist()
+
+
+def test_schedule_table_single_point() -> None:
+    """Test a schedule with a single point has the same output all day."""
+    table = OriScheduleTable.from_timecurve([TimeCurve(hour=12, minute=0, intensity=40, red=10, green=20, blue=30, white=40)])
+
+    assert set(table.channels["intensity"]) == {40}
+
+
+def test_simplify_timecurve_lossless() -> None:
+    """Test simplifying without tolerance only drops points that don't change the schedule."""
+    # A sunrise ramp of a point per minute, followed by a constant day.
+    timecurve = [TimeCurve(hour=6, minute=minute, intensity=minute * 2, red=minute, green=minute, blue=minute, white=minute) for minute in range(51)]
+    timecurve += [
+        TimeCurve(hour=12, minute=0, intensity=100, red=50, green=50, blue=50, white=50),
+        TimeCurve(hour=18, minute=0, intensity=100, red=50, green=50, blue=50, white=50),
+        TimeCurve(hour=20, minute=0, intensity=0, red=0, green=0, blue=0, white=0),
+    ]
+
+    simplified, max_deviation = simplify_timecurve(timecurve, 0)
+
+    assert [(curve.hour, curve.minute) for curve in simplified] == [(6, 0), (6, 50), (18, 0), (20, 0)]
+    assert max_deviation == 0
+    assert OriScheduleTable.from_timecurve(simplified).channels == OriScheduleTable.from_timecurve(timecurve).channels
+
+
+def test_simplify_timecurve_tolerance() -> None:
+    """Test simplifying with a tolerance keeps the deviation of the dropped points within it."""
+    timecurve = [TimeCurve(hour=6, minute=minute, intensity=minute * 2 + minute % 2, red=0, green=0, blue=0, white=0) for minute in range(40)]
+
+    simplified, max_deviation = simplify_timecurve(timecurve, 0)
+    assert len(simplified) == len(timecurve)
+
+    simplified, max_deviation = simplify_timecurve(timecurve, 1)
+    assert len(simplified) == 2
+    assert 0 < max_deviation <= 1
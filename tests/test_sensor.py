@@ -1,12 +1,16 @@
 """Test sensor."""
 
+from datetime import datetime
 from unittest.mock import AsyncMock
 
 import pytest
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
-from . import setup_integration, unload_integration
-from .test_helpers import check_state_value, create_test_device
+from . import flush_updates, setup_integration, unload_integration
+from .test_helpers import check_state_value, create_mqtt_payload, create_test_device
 
 
 @pytest.mark.usefixtures("enable_all_entities")
@@ -24,6 +28,8 @@ async def test_sensors(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock)
     check_state_value(hass, "sensor.test_device_wifi_signal", "-70")
     check_state_value(hass, "sensor.test_device_ssid", "TestWiFi")
     check_state_value(hass, "sensor.test_device_uptime", "2024-06-26T11:06:40+00:00")
+    # No commands have been sent yet.
+    check_state_value(hass, "sensor.test_device_command_latency_p50", "unknown")
 
     await unload_integration(hass, config_entry)
 
@@ -73,3 +79,40 @@ async def test_sensors_available_with_live_mqtt_and_stale_http_offline(hass: Hom
     check_state_value(hass, "sensor.test_device_wifi_signal", "-70")
 
     await unload_integration(hass, config_entry)
+
+
+async def test_expected_intensity(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock, freezer: FrozenDateTimeFactory) -> None:
+    """Test the expected intensity follows the schedule, every minute."""
+    # The schedule goes from intensity 50 at 08:00 to 80 at 18:30.
+    freezer.move_to(datetime(2025, 6, 1, 18, 0, tzinfo=dt_util.get_default_time_zone()))
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    check_state_value(hass, "sensor.test_device_expected_intensity", "79")
+    state = hass.states.get("sensor.test_device_expected_intensity")
+    assert state
+    assert len(state.attributes["curve"]) == 1440
+    assert state.attributes["curve"][18 * 60] == 79
+    assert state.state_info is not None
+    assert "curve" in state.state_info["unrecorded_attributes"]
+
+    freezer.move_to(datetime(2025, 6, 1, 18, 30, tzinfo=dt_util.get_default_time_zone()))
+    # Keep the device available, its data would be older than the MQTT freshness window otherwise.
+    device.update_mqtt_data(create_mqtt_payload())
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    check_state_value(hass, "sensor.test_device_expected_intensity", "80")
+
+    # A new schedule replaces the table, a single point has the same intensity all day.
+    device.update_mqtt_data(create_mqtt_payload({"timecurve": [1, 8, 0, 40, 10, 20, 30, 40]}))
+    await flush_updates(hass)
+
+    check_state_value(hass, "sensor.test_device_expected_intensity", "40")
+    state = hass.states.get("sensor.test_device_expected_intensity")
+    assert state
+    assert set(state.attributes["curve"]) == {40}
+
+    await unload_integration(hass, config_entry)
@@ -3,14 +3,17 @@
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
-from homeassistant.const import ATTR_DEVICE_ID
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import ServiceValidationError
+from homeassistant.components.light import ATTR_BRIGHTNESS
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.area_registry import AreaRegistry
 from homeassistant.helpers.device_registry import DeviceRegistry
 from ori.const import DOMAIN
-from ori.services import ATTR_SCHEDULE, SERVICE_SET_SCHEDULE, get_config
+from ori.services import ATTR_SCHEDULE, ATTR_SIMPLIFY_TOLERANCE, SERVICE_GET_SCHEDULE, SERVICE_SET_LIGHT_BULK, SERVICE_SET_SCHEDULE
 
-from custom_components.ori.services import get_device, get_device_entry, parse_timecurves, validate_curve
+from aquatlantis_ori import LightOptions, PowerType, TimeCurve
+from custom_components.ori.services import get_device, get_device_entry, parse_curve, parse_timecurves
 
 from . import setup_integration, unload_integration
 from .test_helpers import create_test_device
@@ -42,9 +45,267 @@ async def test_service_set_schedule(hass: HomeAssistant, device_registry: Device
     await unload_integration(hass, config_entry)
 
 
-def test_validate_curve_valid() -> None:
-    """Test validate_curve with valid input."""
-    assert validate_curve("12,30,50,60,70,80,90") is True
+async def test_service_set_schedule_skips_unchanged(
+    hass: HomeAssistant, device_registry: DeviceRegistry, area_registry: AreaRegistry, mock_aquatlantis_client: AsyncMock
+) -> None:
+    """Test set_schedule for an area only sends the schedule to devices with a different schedule."""
+    devices = [
+        create_test_device(),
+        create_test_device(
+            {
+                "device_id": "device456",
+                "name": "Second Device",
+                "devid": "seconddevid",
+                "mac": "00:11:22:33:44:77",
+                "timecurve": [1, 12, 30, 50, 60, 70, 80, 90],
+            }
+        ),
+    ]
+    mock_aquatlantis_client.get_devices.return_value = devices
+
+    config_entry = await setup_integration(hass)
+
+    area = area_registry.async_create("Aquarium")
+    device_ids = []
+    for device in devices:
+        ha_device = device_registry.async_get_device(identifiers={(DOMAIN, str(device.id))})
+        assert ha_device
+        device_registry.async_update_device(ha_device.id, area_id=area.id)
+        device_ids.append(ha_device.id)
+
+    with patch("aquatlantis_ori.device.Device.set_timecurve") as call:
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_SCHEDULE,
+            {ATTR_AREA_ID: area.id, ATTR_SCHEDULE: ["12,30,50,60,70,80,90"]},
+            blocking=True,
+            return_response=True,
+        )
+        await hass.async_block_till_done()
+
+    call.assert_called_once()
+    assert response == {"updated": [device_ids[0]], "skipped": [device_ids[1]], "failed": []}
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_service_set_schedule_simplified(hass: HomeAssistant, device_registry: DeviceRegistry, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test set_schedule drops the entries the schedule doesn't need and reports them."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    ha_device = device_registry.async_get_device(identifiers={(DOMAIN, str(device.id))})
+    assert ha_device
+
+    with patch("aquatlantis_ori.device.Device.set_timecurve") as call:
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_SCHEDULE,
+            {
+                ATTR_DEVICE_ID: ha_device.id,
+                ATTR_SCHEDULE: ["8,0,0,0,0,0,0", "9,0,50,50,50,50,50", "10,0,100,100,100,100,100", "20,0,0,0,0,0,0"],
+                ATTR_SIMPLIFY_TOLERANCE: 0,
+            },
+            blocking=True,
+            return_response=True,
+        )
+        await hass.async_block_till_done()
+
+    assert len(call.call_args.args[0]) == 3
+    assert response == {"updated": [ha_device.id], "skipped": [], "failed": [], "simplification": {"dropped": 1, "max_deviation": 0.0}}
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_service_set_schedule_queue_full(hass: HomeAssistant, device_registry: DeviceRegistry, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test set_schedule reports a device with a full command queue as failed, and still sets the schedule of the others."""
+    devices = [
+        create_test_device(),
+        create_test_device({"device_id": "device456", "name": "Second Device", "devid": "seconddevid", "mac": "00:11:22:33:44:77"}),
+    ]
+    mock_aquatlantis_client.get_devices.return_value = devices
+
+    config_entry = await setup_integration(hass)
+
+    ha_devices = [device_registry.async_get_device(identifiers={(DOMAIN, str(device.id))}) for device in devices]
+    device_ids = [ha_device.id for ha_device in ha_devices if ha_device]
+    assert len(device_ids) == len(devices)
+
+    # The queue of the first device is full, the second device is not affected.
+    with patch("custom_components.ori.commands.OriCommandQueue.async_put", side_effect=[HomeAssistantError("Too many commands"), None]):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_SCHEDULE,
+            {ATTR_DEVICE_ID: device_ids, ATTR_SCHEDULE: ["12,30,50,60,70,80,90"]},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert response == {"updated": [device_ids[1]], "skipped": [], "failed": [{"device_id": device_ids[0], "error": "Too many commands"}]}
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_service_get_schedule(hass: HomeAssistant, device_registry: DeviceRegistry, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test get_schedule returns the schedule of a device in the object format."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    ha_device = device_registry.async_get_device(identifiers={(DOMAIN, str(device.id))})
+    assert ha_device
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_SCHEDULE,
+        {ATTR_DEVICE_ID: ha_device.id},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "devices": {
+            ha_device.id: {
+                "schedule": [
+                    {"hour": 8, "minute": 0, "intensity": 50, "red": 10, "green": 20, "blue": 30, "white": 40},
+                    {"hour": 18, "minute": 30, "intensity": 80, "red": 60, "green": 70, "blue": 80, "white": 90},
+                ]
+            }
+        }
+    }
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_service_get_schedule_area(
+    hass: HomeAssistant, device_registry: DeviceRegistry, area_registry: AreaRegistry, mock_aquatlantis_client: AsyncMock
+) -> None:
+    """Test get_schedule for an area returns every device, with an empty schedule for a device without one."""
+    devices = [
+        create_test_device({"timecurve": [1, 12, 30, 50, 60, 70, 80, 90]}),
+        create_test_device({"device_id": "device456", "name": "Second Device", "devid": "seconddevid", "mac": "00:11:22:33:44:77"}),
+    ]
+    devices[1].timecurve = None
+    mock_aquatlantis_client.get_devices.return_value = devices
+
+    config_entry = await setup_integration(hass)
+
+    area = area_registry.async_create("Aquarium")
+    device_ids = []
+    for device in devices:
+        ha_device = device_registry.async_get_device(identifiers={(DOMAIN, str(device.id))})
+        assert ha_device
+        device_registry.async_update_device(ha_device.id, area_id=area.id)
+        device_ids.append(ha_device.id)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_SCHEDULE,
+        {ATTR_AREA_ID: area.id},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "devices": {
+            device_ids[0]: {"schedule": [{"hour": 12, "minute": 30, "intensity": 50, "red": 60, "green": 70, "blue": 80, "white": 90}]},
+            device_ids[1]: {"schedule": []},
+        }
+    }
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_service_get_schedule_round_trip(hass: HomeAssistant, device_registry: DeviceRegistry, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test the schedule returned by get_schedule is accepted by set_schedule, to copy it to another device."""
+    devices = [
+        create_test_device(),
+        create_test_device(
+            {
+                "device_id": "device456",
+                "name": "Second Device",
+                "devid": "seconddevid",
+                "mac": "00:11:22:33:44:77",
+                "timecurve": [1, 12, 30, 50, 60, 70, 80, 90],
+            }
+        ),
+    ]
+    mock_aquatlantis_client.get_devices.return_value = devices
+
+    config_entry = await setup_integration(hass)
+
+    device_ids = []
+    for device in devices:
+        ha_device = device_registry.async_get_device(identifiers={(DOMAIN, str(device.id))})
+        assert ha_device
+        device_ids.append(ha_device.id)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_SCHEDULE,
+        {ATTR_DEVICE_ID: device_ids[0]},
+        blocking=True,
+        return_response=True,
+    )
+    assert response
+
+    with patch("aquatlantis_ori.device.Device.set_timecurve") as call:
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_SCHEDULE,
+            {ATTR_DEVICE_ID: device_ids, ATTR_SCHEDULE: response["devices"][device_ids[0]]["schedule"]},
+            blocking=True,
+            return_response=True,
+        )
+        await hass.async_block_till_done()
+
+    call.assert_called_once_with(devices[0].timecurve)
+    assert response == {"updated": [device_ids[1]], "skipped": [device_ids[0]], "failed": []}
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_service_set_light_bulk(hass: HomeAssistant, device_registry: DeviceRegistry, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test set_light_bulk service changes every device and reports the result per device."""
+    devices = [
+        create_test_device(),
+        create_test_device({"device_id": "device456", "name": "Second Device", "devid": "seconddevid", "mac": "00:11:22:33:44:77"}),
+    ]
+    mock_aquatlantis_client.get_devices.return_value = devices
+
+    config_entry = await setup_integration(hass)
+
+    ha_devices = [device_registry.async_get_device(identifiers={(DOMAIN, str(device.id))}) for device in devices]
+    device_ids = [ha_device.id for ha_device in ha_devices if ha_device]
+    assert len(device_ids) == len(devices)
+
+    with patch("aquatlantis_ori.device.Device.set_light") as call:
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_LIGHT_BULK,
+            {ATTR_DEVICE_ID: [*device_ids, "nonexistent"], ATTR_BRIGHTNESS: 255},
+            blocking=True,
+            return_response=True,
+        )
+        await hass.async_block_till_done()
+
+    assert call.call_count == len(devices)
+    call.assert_called_with(PowerType.ON, LightOptions(intensity=100))
+    assert response is not None
+    results = response["devices"]
+    assert results[device_ids[0]] == {"success": True}
+    assert results[device_ids[1]] == {"success": True}
+    assert results["nonexistent"]["success"] is False
+
+    await unload_integration(hass, config_entry)
+
+
+def test_parse_curve_valid() -> None:
+    """Test parse_curve with valid input."""
+    assert parse_curve("12,30,50,60,70,80,90") == TimeCurve(hour=12, minute=30, intensity=50, red=60, green=70, blue=80, white=90)
 
 
 @pytest.mark.parametrize(
@@ -57,11 +318,13 @@ def test_validate_curve_valid() -> None:
         ("12,60,50,60,70,80,90"),  # minute > 59
         ("12,30,101,60,70,80,90"),  # intensity > 100
         ("12,30,-1,60,70,80,90"),  # intensity < 0
+        ({"hour": 24, "minute": 30, "intensity": 50, "red": 60, "green": 70, "blue": 80, "white": 90}),  # hour > 23
+        ({"hour": 12, "minute": 30, "intensity": -1, "red": 60, "green": 70, "blue": 80, "white": 90}),  # intensity < 0
     ],
 )
-def test_validate_curve_invalid(curve: str) -> None:
-    """Test validate_curve with invalid format."""
-    assert not validate_curve(curve)
+def test_parse_curve_invalid(curve: str | dict[str, int]) -> None:
+    """Test parse_curve with invalid format."""
+    assert parse_curve(curve) is None
 
 
 def test_parse_timecurves_valid() -> None:
@@ -80,45 +343,75 @@ def test_parse_timecurves_invalid() -> None:
         parse_timecurves(curves)
 
 
+def test_parse_timecurves_reports_all_invalid() -> None:
+    """Test parse_timecurves reports every invalid curve at once."""
+    curves = ["24,0,0,0,0,0,0", "12,30,50,60,70,80,90", "1,2,3", {"hour": 12}]
+    with pytest.raises(ServiceValidationError) as exc:
+        parse_timecurves(curves)
+    assert exc.value.translation_placeholders == {"curve": "24,0,0,0,0,0,0; 1,2,3; {'hour': 12}"}
+
+
+def test_parse_timecurves_objects() -> None:
+    """Test parse_timecurves with curves as objects."""
+    curves = [
+        {"hour": 12, "minute": 30, "intensity": 50, "red": 60, "green": 70, "blue": 80, "white": 90},
+        "12, 30, 50, 60, 70, 80, 90",
+    ]
+    result = parse_timecurves(curves)
+    assert result[0] == result[1]
+    assert result[0].minute == 30
+    assert result[0].white == 90
+
+
+@pytest.mark.parametrize(
+    ("curve"),
+    [
+        {"hour": 12, "minute": 30, "intensity": 50, "red": 60, "green": 70, "blue": 80},  # Missing white
+        {"hour": 12, "minute": 30, "intensity": 50, "red": 60, "green": 70, "blue": 80, "white": 101},  # white > 100
+        {"hour": "12", "minute": 30, "intensity": 50, "red": 60, "green": 70, "blue": 80, "white": 90},  # Not an integer
+    ],
+)
+def test_parse_timecurves_invalid_objects(curve: dict[str, object]) -> None:
+    """Test parse_timecurves with invalid curve objects raises error."""
+    with pytest.raises(ServiceValidationError):
+        parse_timecurves([curve])
+
+
 def test_get_device_entry_device_not_found(hass: HomeAssistant) -> None:
     """Test get_device_entry raises error when device not found."""
     fake_device_id = "nonexistent"
-    call = ServiceCall(hass=hass, domain="ori", service="set_schedule", data={"device_id": fake_device_id})
-
     mock_registry = Mock()
     mock_registry.async_get.return_value = None
     with (
         patch("custom_components.ori.services.dr.async_get", return_value=mock_registry),
         pytest.raises(ServiceValidationError) as exc,
     ):
-        get_device_entry(hass, call)
+        get_device_entry(hass, fake_device_id)
     assert exc.value.translation_key == "device_entry_not_found"
 
 
-def test_get_config_entry_not_found() -> None:
-    """Test get_config raises error when config entry not found."""
-    hass = Mock(spec=HomeAssistant)
-    hass.config_entries = Mock()
-    hass.config_entries.async_get_entry = Mock(return_value=None)
+def test_get_device_not_found(hass: HomeAssistant) -> None:
+    """Test get_device raises error when device not found."""
     device_entry = Mock()
-    device_entry.config_entries = ["entry_id_1", "entry_id_2"]
+    device_entry.identifiers = {(DOMAIN, "missing_id")}
 
     with pytest.raises(ServiceValidationError) as exc:
-        get_config(hass, device_entry)
-    assert exc.value.translation_key == "config_entry_not_found"
+        get_device(hass, device_entry)
+    assert exc.value.translation_key == "device_not_found"
 
 
-def test_get_device_not_found() -> None:
-    """Test get_device raises error when device not found."""
+async def test_get_device(hass: HomeAssistant, mock_aquatlantis_client: AsyncMock) -> None:
+    """Test get_device finds the devices of a config entry until it is unloaded."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
     device_entry = Mock()
-    device_entry.identifiers = {(DOMAIN, "missing_id")}
-    config = Mock()
-    # Simulate runtime_data.get_devices() returns devices with different IDs
-    config.runtime_data.get_devices.return_value = [
-        Mock(id="other_id"),
-        Mock(id="another_id"),
-    ]
+    device_entry.identifiers = {(DOMAIN, str(device.id))}
+    assert get_device(hass, device_entry) == (config_entry, device)
 
-    with pytest.raises(ServiceValidationError) as exc:
-        get_device(device_entry, config)
-    assert exc.value.translation_key == "device_not_found"
+    await unload_integration(hass, config_entry)
+
+    with pytest.raises(ServiceValidationError):
+        get_device(hass, device_entry)
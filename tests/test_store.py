@@ -0,0 +1,118 @@
+"""Test store."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from aquatlantis_ori import LightType, SensorType
+from custom_components.ori.const import DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+from custom_components.ori.store import OriDeviceSnapshot
+
+from . import flush_updates, get_mock_config_entry, setup_integration, unload_integration
+from .test_helpers import check_state_value, create_mqtt_payload, create_test_device
+
+STORAGE_KEY = f"{DOMAIN}.test_entry"
+
+
+def _stored_snapshot(hass_storage: dict[str, Any], snapshot: OriDeviceSnapshot) -> None:
+    """Store a device snapshot for the mock config entry."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {"devices": {"device123": snapshot.as_dict()}},
+    }
+
+
+def test_snapshot_round_trip() -> None:
+    """Test a snapshot survives being stored."""
+    snapshot = OriDeviceSnapshot(light_type=LightType.RGBW_ULTRA, sensor_type=SensorType.TEMPERATURE, water_temperature_thresholds=(20.0, 30.0))
+
+    assert OriDeviceSnapshot.from_dict(snapshot.as_dict()) == snapshot
+
+
+def test_snapshot_from_device() -> None:
+    """Test a snapshot is created from device data."""
+    snapshot = OriDeviceSnapshot.from_device(create_test_device())
+
+    assert snapshot == OriDeviceSnapshot(
+        light_type=LightType.RGBW_ULTRA, sensor_type=SensorType.TEMPERATURE, water_temperature_thresholds=(20.0, 30.0)
+    )
+
+
+async def test_snapshot_saved(hass: HomeAssistant, hass_storage: dict[str, Any], mock_aquatlantis_client: AsyncMock) -> None:
+    """Test the snapshot of a ready device is stored."""
+    device = create_test_device()
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY))
+    await hass.async_block_till_done()
+
+    assert hass_storage[STORAGE_KEY]["data"]["devices"] == {"device123": OriDeviceSnapshot.from_device(device).as_dict()}
+
+    await unload_integration(hass, config_entry)
+
+
+@pytest.mark.usefixtures("enable_all_entities")
+async def test_entities_created_from_snapshot(hass: HomeAssistant, hass_storage: dict[str, Any], mock_aquatlantis_client: AsyncMock) -> None:
+    """Test entities are created from the stored snapshot before the device pushed data."""
+    _stored_snapshot(
+        hass_storage,
+        OriDeviceSnapshot(light_type=LightType.RGBW_ULTRA, sensor_type=SensorType.TEMPERATURE, water_temperature_thresholds=(20.0, 30.0)),
+    )
+    device = create_test_device({"light_type": None, "sensor_type": None, "water_temp_thrd": None})
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    assert hass.states.get("light.test_device_light") is not None
+    assert hass.states.get("sensor.test_device_water_temperature") is not None
+    assert hass.states.get("binary_sensor.test_device_water_temperature") is not None
+
+    # The live data matches the snapshot, so no reload is needed.
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        device.update_mqtt_data(create_mqtt_payload())
+        await flush_updates(hass)
+
+    reload.assert_not_called()
+    check_state_value(hass, "sensor.test_device_water_temperature", "25.0")
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_changed_snapshot_reloads(hass: HomeAssistant, hass_storage: dict[str, Any], mock_aquatlantis_client: AsyncMock) -> None:
+    """Test the config entry is reloaded when the live data doesn't match the stored snapshot."""
+    _stored_snapshot(hass_storage, OriDeviceSnapshot(light_type=LightType.RGBW_ULTRA, sensor_type=None, water_temperature_thresholds=None))
+    device = create_test_device({"light_type": None, "sensor_type": None, "water_temp_thrd": None})
+    mock_aquatlantis_client.get_devices.return_value = [device]
+
+    config_entry = await setup_integration(hass)
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        device.update_mqtt_data(create_mqtt_payload())
+        await hass.async_block_till_done()
+
+    reload.assert_called_once_with(config_entry.entry_id)
+
+    await unload_integration(hass, config_entry)
+
+
+async def test_remove_entry(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test the stored snapshots are removed with the config entry."""
+    config_entry = get_mock_config_entry()
+    _stored_snapshot(hass_storage, OriDeviceSnapshot(light_type=None, sensor_type=None, water_temperature_thresholds=None))
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert STORAGE_KEY not in hass_storage